@@ -1,6 +1,4 @@
-import psutil
-from fastapi import APIRouter, Depends, Response
-from prometheus_client import generate_latest
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 from app.util.enums.environment import Api_Environment
@@ -8,10 +6,12 @@ from app.infrastructure.settings.api_settings import settings
 from app.infrastructure.settings.redis_client import redis_instance
 from app.util.enums.health import DatabaseQuery
 from app.util.functions.api_datetime import api_datetime
-from app.util.dtos.health import HealthDTO, MonitoringSystem
+from app.util.dtos.health import HealthDTO
 from app.util.mappers.api_response import ApiResponse
 from app.util.constants import api_endpoint_info
 from app.handlers.error.response_error_exception import ResponseErrorException
+from app.handlers.monitoring.metrics_exposition import metrics_exposition
+from app.core.services.system_metrics import system_metrics_sampler
 from app.infrastructure.database.adapters.postgres_db import get_conection_database
     
 router = APIRouter()
@@ -34,15 +34,12 @@ def health_check(db: Session = Depends(get_conection_database)):
     try:
         db.execute(text(DatabaseQuery.HEALTH_SELECT))
         checks.update_service(service_name="database", status="healthy")  
-
-        if settings.ENVIRONMENT == Api_Environment.DEV:
-            checks.system_monitoring = MonitoringSystem(
-                memory_usage=psutil.virtual_memory().percent,
-                cpu_usage=psutil.cpu_percent(interval=1),
-                disk_usage=psutil.disk_usage('/').percent
-            )
     except Exception as e:
         checks.update_service(service_name="database", status=f"unhealthy: {str(e)}")
+
+    # Último snapshot del sampler en segundo plano, None hasta el primer intervalo
+    if settings.ENVIRONMENT == Api_Environment.DEV:
+        checks.system_monitoring = system_metrics_sampler.snapshot
     
     # Check Redis
     try:
@@ -53,6 +50,15 @@ def health_check(db: Session = Depends(get_conection_database)):
 
     return ApiResponse[HealthDTO](api_message="Services status",api_data=checks)
     
+@router.get("/ready",
+            tags=["Health"],
+            summary="Reports whether the startup warm-up has completed",
+            response_model=ApiResponse[bool])
+async def readiness_check(request: Request):
+    if not getattr(request.app.state, "is_ready", False):
+        raise ResponseErrorException.service_unavailable("Service is warming up")
+    return ApiResponse[bool](api_message="Service ready", api_data=True)
+
 @router.get("/api-errors/{error_type}",
             summary="Check the error handling mechanism",
             responses=api_endpoint_info.API_ERROR_DESCRIPTION,
@@ -64,7 +70,13 @@ def health_check_custom_error(error_type: str):
     else:
         raise ResponseErrorException.not_found("The specified error type does not exist.")
 
-@router.get("/metrics", summary="Expose basic metrics for monitoring")
-async def metrics_endpoint():
-    metrics_data = generate_latest()
-    return ApiResponse[str](api_message="Metrics data", api_data=metrics_data.decode('utf-8'))
+@router.get("/metrics", summary="Expose Prometheus metrics of every worker")
+def metrics_endpoint(request: Request):
+    payload, content_type, gzipped = metrics_exposition.render(
+        accept=request.headers.get("accept"),
+        accept_encoding=request.headers.get("accept-encoding")
+    )
+    headers = {"Content-Type": content_type, "Vary": "Accept, Accept-Encoding"}
+    if gzipped:
+        headers["Content-Encoding"] = "gzip"
+    return Response(content=payload, headers=headers)
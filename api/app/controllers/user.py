@@ -1,30 +1,166 @@
 from app.infrastructure.settings.logger import logger
-from app.util.mappers.api_response import ApiResponse
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from app.util.mappers.api_response import ApiResponse, api_json_response, api_json_response_from_data
+from typing import Optional, List
+from uuid import UUID
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.handlers.error.response_error_exception import ResponseErrorException
-from app.util.dtos.user import UserDTO, UserResponseDTO
-from app.infrastructure.database.adapters.postgres_db import get_conection_database
-from app.infrastructure.database.repositories.user_repository import UserRepository
-from app.core.services.user import UserService
+from app.util.dtos.user import (
+    UserDTO,
+    UserUpdateDTO,
+    UserBulkDeactivateDTO,
+    UserLookupDTO,
+    UserResponseDTO,
+    UserImportReportDTO,
+    UserPageDTO,
+    UserStatsDTO,
+    UserAvailabilityDTO
+)
+from app.util.functions.stream_records import iter_csv_records, iter_ndjson_records, gzip_stream
+from app.util.enums.export_format import ExportFormat
+from app.infrastructure.database.adapters.postgres_db import AsyncSessionLocal, get_async_conection_database
+from app.infrastructure.database.repositories.async_user_repository import AsyncUserRepository
+from app.core.services.user import AsyncUserService
+from app.core.services.user_availability import UserAvailabilityService
 
 router = APIRouter()
 
 
-def get_user_service(db: Session = Depends(get_conection_database)) -> UserService:
-    """Dependency injection for UserService"""
-    repository = UserRepository(db)
-    return UserService(repository)
+async def get_user_service(db: AsyncSession = Depends(get_async_conection_database)) -> AsyncUserService:
+    """Dependency injection for AsyncUserService"""
+    repository = AsyncUserRepository(db)
+    return AsyncUserService(repository)
 
 
 @router.post("/create-user", tags=["User"], summary="Create a new user", response_model=ApiResponse[UserResponseDTO])
-def create_user(user: UserDTO, service: UserService = Depends(get_user_service)):
+async def create_user(user: UserDTO, service: AsyncUserService = Depends(get_user_service)):
     try:
-        created_user = service.create_user(user)
+        created_user = await service.create_user(user)
         logger.info(f"User created: {created_user.username}", extra={"user_id": created_user.id})
-        return ApiResponse[UserResponseDTO](api_message="User created successfully", api_data=created_user)
+        return api_json_response(ApiResponse[UserResponseDTO](api_message="User created successfully", api_data=created_user))
     except ResponseErrorException:
         raise
     except Exception as e:
         logger.error(f"Unexpected error creating user: {str(e)}", extra={"error": str(e)})
         raise ResponseErrorException.bad_request("Unexpected error creating user", str(e))
+
+
+@router.post("/import",
+             tags=["User"],
+             summary="Bulk import users from a streamed NDJSON or CSV body",
+             response_model=ApiResponse[UserImportReportDTO])
+async def import_users(request: Request, service: AsyncUserService = Depends(get_user_service)):
+    content_type = request.headers.get("content-type", "")
+    if "csv" in content_type:
+        records = iter_csv_records(request.stream())
+    elif "json" in content_type:
+        records = iter_ndjson_records(request.stream())
+    else:
+        raise ResponseErrorException.bad_request("Content-Type must be application/x-ndjson or text/csv")
+
+    try:
+        report = await service.import_users(records)
+        logger.info("Users imported", extra={"imported": report.imported, "failed": report.failed})
+        return api_json_response(ApiResponse[UserImportReportDTO](api_message="Users import finished", api_data=report))
+    except ResponseErrorException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error importing users: {str(e)}", extra={"error": str(e)})
+        raise ResponseErrorException.bad_request("Unexpected error importing users", str(e))
+
+
+@router.get("/list",
+            tags=["User"],
+            summary="List users with cursor pagination",
+            response_model=ApiResponse[UserPageDTO])
+async def list_users(
+    cursor: Optional[str] = Query(None, description="next_cursor returned by the previous page"),
+    limit: int = Query(50, ge=1, le=500),
+    service: AsyncUserService = Depends(get_user_service)
+):
+    page = await service.list_users(cursor, limit)
+    return api_json_response_from_data("Users found", page)
+
+
+@router.get("/stats",
+            tags=["User"],
+            summary="Total, active and admin user counts",
+            response_model=ApiResponse[UserStatsDTO])
+async def get_user_stats(service: AsyncUserService = Depends(get_user_service)):
+    stats = await service.get_user_stats()
+    return api_json_response(ApiResponse[UserStatsDTO](api_message="User stats", api_data=stats))
+
+
+@router.get("/export",
+            tags=["User"],
+            summary="Stream every user as NDJSON or CSV",
+            response_class=StreamingResponse)
+async def export_users(
+    format: ExportFormat = Query(ExportFormat.NDJSON),
+    gzip: bool = Query(False, description="Compress the stream with gzip transfer encoding")
+):
+    async def stream_users():
+        # The stream outlives the endpoint, so it owns its session instead of using the request one
+        async with AsyncSessionLocal() as db:
+            async for chunk in AsyncUserService(AsyncUserRepository(db)).export_users(format):
+                yield chunk
+
+    media_type = "text/csv" if format == ExportFormat.CSV else "application/x-ndjson"
+    headers = {"Content-Disposition": f'attachment; filename="users.{format.value}"'}
+    body = stream_users()
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+        body = gzip_stream(body)
+    logger.info("Users export started", extra={"format": format.value, "gzip": gzip})
+    return StreamingResponse(body, media_type=media_type, headers=headers)
+
+
+@router.get("/availability",
+            tags=["User"],
+            summary="Check whether a username and/or email can be registered",
+            response_model=ApiResponse[UserAvailabilityDTO])
+async def check_availability(
+    username: Optional[str] = Query(None, min_length=3, max_length=50),
+    email: Optional[str] = Query(None, max_length=100),
+    service: AsyncUserService = Depends(get_user_service)
+):
+    if username is None and email is None:
+        raise ResponseErrorException.bad_request("Provide a username or an email to check")
+    availability = await UserAvailabilityService(service.cached_user_repository).check(username, email)
+    return api_json_response(ApiResponse[UserAvailabilityDTO](api_message="Availability checked", api_data=availability))
+
+
+@router.post("/lookup",
+             tags=["User"],
+             summary="Get many users by id, null for the ids that do not exist",
+             response_model=ApiResponse[List[Optional[UserResponseDTO]]])
+async def lookup_users(request: UserLookupDTO, service: AsyncUserService = Depends(get_user_service)):
+    users = await service.load_users(request.user_ids)
+    return api_json_response(ApiResponse[List[Optional[UserResponseDTO]]](api_message="Users found", api_data=users))
+
+
+@router.post("/bulk-deactivate",
+             tags=["User"],
+             summary="Deactivate many users at once",
+             response_model=ApiResponse[List[UserResponseDTO]])
+async def bulk_deactivate_users(request: UserBulkDeactivateDTO, service: AsyncUserService = Depends(get_user_service)):
+    users = await service.bulk_deactivate_users(request.user_ids)
+    logger.info("Users deactivated", extra={"requested": len(request.user_ids), "deactivated": len(users)})
+    return api_json_response(ApiResponse[List[UserResponseDTO]](api_message="Users deactivated successfully", api_data=users))
+
+
+@router.patch("/{user_id}",
+              tags=["User"],
+              summary="Update only the fields sent for a user",
+              response_model=ApiResponse[UserResponseDTO])
+async def update_user(user_id: UUID, user: UserUpdateDTO, service: AsyncUserService = Depends(get_user_service)):
+    try:
+        updated_user = await service.update_user(user_id, user)
+        logger.info(f"User updated: {updated_user.username}", extra={"user_id": updated_user.id})
+        return api_json_response(ApiResponse[UserResponseDTO](api_message="User updated successfully", api_data=updated_user))
+    except ResponseErrorException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error updating user: {str(e)}", extra={"error": str(e)})
+        raise ResponseErrorException.bad_request("Unexpected error updating user", str(e))
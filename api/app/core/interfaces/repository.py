@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import TypeVar, Generic, Optional, List
+from typing import TypeVar, Generic, Optional, List, Dict, Any
 from uuid import UUID
 
 T = TypeVar('T')
@@ -17,6 +17,11 @@ class BaseRepository(ABC, Generic[T]):
         """Get entity by ID"""
         pass
     
+    @abstractmethod
+    def get_many(self, ids: List[UUID]) -> List[T]:
+        """Get every existing entity among the given IDs with one query"""
+        pass
+    
     @abstractmethod
     def get_all(self, skip: int = 0, limit: int = 100) -> List[T]:
         """Get all entities with pagination"""
@@ -31,3 +36,57 @@ class BaseRepository(ABC, Generic[T]):
     def delete(self, id: UUID) -> bool:
         """Delete entity by ID"""
         pass
+    
+    @abstractmethod
+    def partial_update(self, id: UUID, values: Dict[str, Any]) -> Optional[T]:
+        """Update only the given columns of an entity with one statement"""
+        pass
+    
+    @abstractmethod
+    def bulk_update(self, ids: List[UUID], values: Dict[str, Any]) -> List[T]:
+        """Set the same column values on many entities with one statement"""
+        pass
+
+
+class AsyncBaseRepository(ABC, Generic[T]):
+    """Abstract async base repository defining standard CRUD operations"""
+    
+    @abstractmethod
+    async def create(self, entity: T) -> T:
+        """Create a new entity"""
+        pass
+    
+    @abstractmethod
+    async def get_by_id(self, id: UUID) -> Optional[T]:
+        """Get entity by ID"""
+        pass
+    
+    @abstractmethod
+    async def get_many(self, ids: List[UUID]) -> List[T]:
+        """Get every existing entity among the given IDs with one query"""
+        pass
+    
+    @abstractmethod
+    async def get_all(self, skip: int = 0, limit: int = 100) -> List[T]:
+        """Get all entities with pagination"""
+        pass
+    
+    @abstractmethod
+    async def update(self, id: UUID, entity: T) -> Optional[T]:
+        """Update an existing entity"""
+        pass
+    
+    @abstractmethod
+    async def delete(self, id: UUID) -> bool:
+        """Delete entity by ID"""
+        pass
+    
+    @abstractmethod
+    async def partial_update(self, id: UUID, values: Dict[str, Any]) -> Optional[T]:
+        """Update only the given columns of an entity with one statement"""
+        pass
+    
+    @abstractmethod
+    async def bulk_update(self, ids: List[UUID], values: Dict[str, Any]) -> List[T]:
+        """Set the same column values on many entities with one statement"""
+        pass
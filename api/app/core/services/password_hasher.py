@@ -0,0 +1,102 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+from passlib.context import CryptContext
+
+from app.handlers.error.response_error_exception import ResponseErrorException
+from app.handlers.monitoring.password_hasher_monitoring import (
+    PASSWORD_HASH_QUEUE_DEPTH,
+    PASSWORD_HASH_LATENCY,
+    PASSWORD_HASH_REJECTED
+)
+from app.infrastructure.settings.api_settings import settings
+from app.infrastructure.settings.logger import logger
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def _hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify_password(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    """Runs bcrypt in a dedicated process pool so it never holds the API worker's GIL.
+    At most max_pending operations are queued, after that callers fail fast with 503.
+    Callers that wait (imports, warm-up) share at most half of those slots, so
+    interactive sign-ups and logins always have room."""
+    
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._waiting_slots: Optional[asyncio.Semaphore] = None
+    
+    async def hash(self, password: str, wait: bool = False) -> str:
+        """Hash a password, waiting for a free slot only when wait is True"""
+        return await self._submit("hash", wait, _hash_password, password)
+    
+    async def verify(self, plain_password: str, hashed_password: str, wait: bool = False) -> bool:
+        """Verify a password against its hash"""
+        return await self._submit("verify", wait, _verify_password, plain_password, hashed_password)
+    
+    async def warm_up(self):
+        """Start every worker process and load the bcrypt backend in each of them"""
+        await asyncio.gather(*(self.hash("warm-up", wait=True) for _ in range(self.max_workers)))
+    
+    def shutdown(self):
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+    
+    async def _submit(self, operation: str, wait: bool, function, *args):
+        if self._executor is None:
+            self._executor = self._create_executor()
+            self._slots = asyncio.Semaphore(self.max_pending)
+            self._waiting_slots = asyncio.Semaphore(max(1, self.max_pending // 2))
+        
+        if not wait and self._slots.locked():
+            PASSWORD_HASH_REJECTED.labels(operation=operation).inc()
+            raise ResponseErrorException.service_unavailable("Too many password operations in progress, try again later")
+        
+        start_time = time.perf_counter()
+        PASSWORD_HASH_QUEUE_DEPTH.inc()
+        try:
+            if wait:
+                async with self._waiting_slots:
+                    return await self._run(function, *args)
+            return await self._run(function, *args)
+        finally:
+            PASSWORD_HASH_QUEUE_DEPTH.dec()
+            PASSWORD_HASH_LATENCY.labels(operation=operation).observe(time.perf_counter() - start_time)
+    
+    async def _run(self, function, *args):
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            executor = self._executor
+            try:
+                return await loop.run_in_executor(executor, function, *args)
+            except BrokenProcessPool as e:
+                # Un worker murió (OOM, kill) y el pool ya no acepta trabajo: se reemplaza y se reintenta una vez
+                if self._executor is executor:
+                    logger.warning("Password hashing pool broken, recreating it", extra={"error": str(e)})
+                    executor.shutdown(wait=False)
+                    self._executor = self._create_executor()
+                return await loop.run_in_executor(self._executor, function, *args)
+    
+    def _create_executor(self) -> ProcessPoolExecutor:
+        # forkserver: hacer fork de un proceso con hilos (escritor de logs) puede heredar locks tomados
+        return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("forkserver"))
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
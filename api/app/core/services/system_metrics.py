@@ -0,0 +1,95 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Optional
+import psutil
+
+from app.handlers.monitoring.metrics_exposition import refresh_gauge_functions
+from app.handlers.monitoring.system_monitoring import (
+    SYSTEM_CPU_USAGE,
+    SYSTEM_MEMORY_USAGE,
+    SYSTEM_DISK_USAGE,
+    API_PROCESS_CPU_USAGE,
+    API_PROCESS_MEMORY_RSS,
+    API_PROCESS_THREADS
+)
+from app.infrastructure.settings.api_settings import settings
+from app.infrastructure.settings.logger import logger
+from app.util.dtos.health import MonitoringSystem
+
+
+class SystemMetricsSampler:
+    """Samples CPU, memory, disk and process stats every `interval` seconds in the
+    background. Readers get the last snapshot, never wait on psutil. CPU values are
+    averages over the interval; the snapshot is None until the first one is taken."""
+
+    def __init__(self, interval: float, disk_path: str):
+        self.interval = interval
+        self.disk_path = disk_path
+        self.snapshot: Optional[MonitoringSystem] = None
+        self._process = psutil.Process()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self._task is not None:
+            return
+        # La primera llamada a cpu_percent(None) solo fija el punto de partida
+        psutil.cpu_percent(interval=None)
+        self._process.cpu_percent(interval=None)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                # Pool y caché local en modo multiproceso, no hace nada en el modo normal
+                refresh_gauge_functions()
+            except Exception as e:
+                logger.warning("Gauge refresh failed", extra={"error": str(e)})
+            try:
+                # disk_usage puede tardar en discos de red, fuera del event loop
+                snapshot = await asyncio.to_thread(self._sample)
+            except Exception as e:
+                logger.warning("System metrics sampling failed", extra={"error": str(e)})
+                continue
+            self.snapshot = snapshot
+            self._export(snapshot)
+
+    def _sample(self) -> MonitoringSystem:
+        with self._process.oneshot():
+            process_cpu_usage = self._process.cpu_percent(interval=None)
+            process_memory_rss = self._process.memory_info().rss
+            process_threads = self._process.num_threads()
+        return MonitoringSystem(
+            cpu_usage=psutil.cpu_percent(interval=None),
+            memory_usage=psutil.virtual_memory().percent,
+            disk_usage=psutil.disk_usage(self.disk_path).percent,
+            process_cpu_usage=process_cpu_usage,
+            process_memory_rss=process_memory_rss,
+            process_threads=process_threads,
+            sampled_at=datetime.now(timezone.utc).isoformat()
+        )
+
+    @staticmethod
+    def _export(snapshot: MonitoringSystem):
+        SYSTEM_CPU_USAGE.set(snapshot.cpu_usage)
+        SYSTEM_MEMORY_USAGE.set(snapshot.memory_usage)
+        SYSTEM_DISK_USAGE.set(snapshot.disk_usage)
+        API_PROCESS_CPU_USAGE.set(snapshot.process_cpu_usage)
+        API_PROCESS_MEMORY_RSS.set(snapshot.process_memory_rss)
+        API_PROCESS_THREADS.set(snapshot.process_threads)
+
+
+system_metrics_sampler = SystemMetricsSampler(
+    interval=settings.SYSTEM_METRICS_INTERVAL,
+    disk_path=settings.SYSTEM_METRICS_DISK_PATH
+)
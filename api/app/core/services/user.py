@@ -1,13 +1,41 @@
-from typing import Optional, List
+import asyncio
+from typing import Optional, List, Dict, Any, AsyncIterator, Set
 from uuid import UUID
-from passlib.context import CryptContext
+from pydantic import ValidationError
 
+from app.core.services.password_hasher import pwd_context, password_hasher
+from app.core.services.user_availability import register_identifiers
 from app.infrastructure.database.repositories.user_repository import UserRepository
+from app.infrastructure.database.repositories.async_user_repository import AsyncUserRepository
+from app.infrastructure.database.repositories.cached_user_repository import CachedUserRepository
 from app.infrastructure.database.schemas.user import UserSchema
-from app.util.dtos.user import UserDTO, UserResponseDTO
+from app.infrastructure.database.adapters.postgres_db import AsyncSessionLocal
+from app.infrastructure.settings.redis_client import async_redis_instance
+from app.util.dtos.user import (
+    UserDTO,
+    UserUpdateDTO,
+    UserResponseDTO,
+    UserImportReportDTO,
+    UserImportRowErrorDTO,
+    UserStatsDTO
+)
+from app.util.mappers.user_mapper import to_user_response_dto, USER_RESPONSE_FIELDS
+from app.util.enums.export_format import ExportFormat
+from app.util.functions.batch_loader import BatchLoader
+from app.util.functions.pagination_cursor import encode_cursor, decode_cursor
+from app.util.functions.stream_records import StreamRecord, iter_chunks, encode_ndjson_rows, encode_csv_rows
 from app.handlers.error.response_error_exception import ResponseErrorException
+from app.handlers.error.api_validation_error import format_validation_errors
+from app.infrastructure.settings.api_settings import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+USER_STATS_KEY = "user:stats"
+
+
+async def count_users() -> Dict[str, int]:
+    # get_or_compute may refresh in the background after the request ended, so it
+    # cannot use the request session
+    async with AsyncSessionLocal() as db:
+        return await AsyncUserRepository(db).count_by_status()
 
 
 class UserService:
@@ -17,15 +45,8 @@ class UserService:
         self.user_repository = user_repository
     
     def create_user(self, user_data: UserDTO) -> UserResponseDTO:
-        """Create a new user with hashed password"""
-        # Check if email already exists
-        if self.user_repository.get_by_email(user_data.email):
-            raise ResponseErrorException.conflict("Email already registered")
-        
-        # Check if username already exists
-        if self.user_repository.get_by_username(user_data.username):
-            raise ResponseErrorException.conflict("Username already taken")
-        
+        """Create a new user with hashed password.
+        Email and username uniqueness is enforced by the insert itself."""
         # Hash password
         hashed_password = pwd_context.hash(user_data.password)
         
@@ -79,16 +100,216 @@ class UserService:
         """Verify a password against its hash"""
         return pwd_context.verify(plain_password, hashed_password)
     
-    def _to_response_dto(self, user: UserSchema) -> UserResponseDTO:
+    @staticmethod
+    def _to_response_dto(user: UserSchema) -> UserResponseDTO:
         """Convert UserSchema to UserResponseDTO"""
-        return UserResponseDTO(
-            id=str(user.id),
-            first_name=user.first_name,
-            last_name=user.last_name,
-            username=user.username,
-            email=user.email,
-            is_active=user.is_active,
-            is_admin=user.is_admin,
-            created_at=user.created_at,
-            updated_at=user.updated_at
+        return to_user_response_dto(user)
+
+
+class AsyncUserService:
+    """Async service layer for User business logic"""
+    
+    def __init__(self, user_repository: AsyncUserRepository, cached_user_repository: Optional[CachedUserRepository] = None):
+        self.user_repository = user_repository
+        self.cached_user_repository = cached_user_repository or CachedUserRepository(user_repository)
+        # The service is built per request, so is the loader and its memoized users
+        self.user_loader: BatchLoader[UUID, UserSchema] = BatchLoader(user_repository.get_many, key_of=lambda user: user.id)
+    
+    async def create_user(self, user_data: UserDTO) -> UserResponseDTO:
+        """Create a new user with hashed password.
+        Email and username uniqueness is enforced by the insert itself."""
+        # Hash password in the hashing process pool, bcrypt is CPU bound
+        hashed_password = await password_hasher.hash(user_data.password)
+        
+        # Create user entity
+        user_entity = UserSchema(
+            first_name=user_data.first_name,
+            last_name=user_data.last_name,
+            username=user_data.username,
+            email=user_data.email,
+            hashed_password=hashed_password,
+            is_active=user_data.is_active,
+            is_admin=user_data.is_admin
+        )
+        
+        created_user = await self.user_repository.create(user_entity)
+        await register_identifiers([(created_user.username, created_user.email)])
+        return UserService._to_response_dto(created_user)
+    
+    async def import_users(self, records: AsyncIterator[StreamRecord]) -> UserImportReportDTO:
+        """Validate, hash and insert streamed users chunk by chunk, reporting errors per row"""
+        report = UserImportReportDTO()
+        
+        async for chunk in iter_chunks(records, settings.USER_IMPORT_CHUNK_SIZE):
+            report.total_rows += len(chunk)
+            valid_users = self._validate_import_chunk(chunk, report)
+            if not valid_users:
+                continue
+            
+            # Imports wait for free hashing slots instead of being rejected, using at most half of them
+            hashed_passwords = await asyncio.gather(
+                *(password_hasher.hash(user.password, wait=True) for _, user in valid_users)
+            )
+            users_values = [
+                self._to_user_values(user, hashed_password)
+                for (_, user), hashed_password in zip(valid_users, hashed_passwords)
+            ]
+            
+            inserted_emails = await self.user_repository.bulk_create(users_values)
+            report.imported += len(inserted_emails)
+            await register_identifiers(
+                (values["username"], values["email"]) for values in users_values if values["email"] in inserted_emails
+            )
+            
+            rejected_users = [(row, user) for row, user in valid_users if user.email not in inserted_emails]
+            if rejected_users:
+                existing_emails = await self.user_repository.get_existing_emails([user.email for _, user in rejected_users])
+                for row, user in rejected_users:
+                    message = "Email already registered" if user.email in existing_emails else "Username already taken"
+                    report.errors.append(UserImportRowErrorDTO(row=row, errors=[message]))
+        
+        report.failed = report.total_rows - report.imported
+        report.errors.sort(key=lambda error: error.row)
+        return report
+    
+    async def get_user_by_id(self, user_id: UUID) -> UserResponseDTO:
+        """Get user by ID"""
+        user = await self.cached_user_repository.get_by_id(user_id)
+        if not user:
+            raise ResponseErrorException.not_found(f"User with id {user_id} not found")
+        return user
+    
+    async def get_user_by_email(self, email: str) -> Optional[UserResponseDTO]:
+        """Get user by email"""
+        return await self.cached_user_repository.get_by_email(email)
+    
+    async def load_user(self, user_id: UUID) -> Optional[UserResponseDTO]:
+        """Get user by ID, batching with every other load_user awaited in the same tick"""
+        user = await self.user_loader.load(user_id)
+        return UserService._to_response_dto(user) if user else None
+    
+    async def load_users(self, user_ids: List[UUID]) -> List[Optional[UserResponseDTO]]:
+        """Get users by ID with one query, keeping the order of user_ids"""
+        users = await self.user_loader.load_all(user_ids)
+        return [UserService._to_response_dto(user) if user else None for user in users]
+    
+    async def get_all_users(self, skip: int = 0, limit: int = 100) -> List[UserResponseDTO]:
+        """Get all users with pagination"""
+        users = await self.user_repository.get_all(skip, limit)
+        return [UserService._to_response_dto(user) for user in users]
+    
+    async def list_users(self, cursor: Optional[str] = None, limit: int = 100) -> Dict[str, Any]:
+        """Get a page of users using keyset pagination, shaped like UserPageDTO.
+        Items are plain rows, ready to be encoded to JSON as they are."""
+        after = decode_cursor(cursor) if cursor else None
+        # One extra row tells whether there is a next page
+        users = await self.user_repository.get_page_rows(after, limit + 1)
+        
+        next_cursor = None
+        if len(users) > limit:
+            users = users[:limit]
+            next_cursor = encode_cursor(users[-1]["created_at"], users[-1]["id"])
+        
+        return {"items": users, "next_cursor": next_cursor}
+    
+    async def get_user_stats(self) -> UserStatsDTO:
+        """User counts; one worker computes them per ttl and the rest reuse the cached
+        value, served stale for up to USER_STATS_STALE_TTL while it is refreshed"""
+        stats = await async_redis_instance.get_or_compute(
+            USER_STATS_KEY,
+            count_users,
+            ttl=settings.USER_STATS_CACHE_TTL,
+            stale_ttl=settings.USER_STATS_STALE_TTL
         )
+        return UserStatsDTO.model_validate(stats)
+    
+    async def export_users(self, export_format: ExportFormat) -> AsyncIterator[bytes]:
+        """Encode every user batch by batch, memory stays flat whatever the table size"""
+        include_header = True
+        async for rows in self.user_repository.iter_response_rows(settings.USER_EXPORT_BATCH_SIZE):
+            if export_format == ExportFormat.CSV:
+                yield encode_csv_rows(rows, USER_RESPONSE_FIELDS, include_header)
+                include_header = False
+            else:
+                yield encode_ndjson_rows(rows)
+        
+        if export_format == ExportFormat.CSV and include_header:
+            yield encode_csv_rows([], USER_RESPONSE_FIELDS, include_header)
+    
+    async def update_user(self, user_id: UUID, user_data: UserUpdateDTO) -> UserResponseDTO:
+        """Partially update a user, only the fields sent are changed"""
+        values = user_data.model_dump(exclude_unset=True, exclude={"id"})
+        if not values:
+            raise ResponseErrorException.bad_request("No fields to update")
+        if "password" in values:
+            values["hashed_password"] = await password_hasher.hash(values.pop("password"))
+        
+        user = await self.cached_user_repository.partial_update(user_id, values)
+        if not user:
+            raise ResponseErrorException.not_found(f"User with id {user_id} not found")
+        if "email" in values or "username" in values:
+            await register_identifiers([(user.username, user.email)])
+        return UserService._to_response_dto(user)
+    
+    async def bulk_deactivate_users(self, user_ids: List[UUID]) -> List[UserResponseDTO]:
+        """Deactivate many users with one statement, unknown ids are ignored"""
+        users = await self.cached_user_repository.bulk_deactivate(user_ids)
+        return [UserService._to_response_dto(user) for user in users]
+    
+    async def delete_user(self, user_id: UUID) -> bool:
+        """Delete user permanently"""
+        if not await self.cached_user_repository.delete(user_id):
+            raise ResponseErrorException.not_found(f"User with id {user_id} not found")
+        return True
+    
+    async def deactivate_user(self, user_id: UUID) -> UserResponseDTO:
+        """Deactivate user (soft delete)"""
+        user = await self.cached_user_repository.deactivate(user_id)
+        if not user:
+            raise ResponseErrorException.not_found(f"User with id {user_id} not found")
+        return UserService._to_response_dto(user)
+    
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash"""
+        return await password_hasher.verify(plain_password, hashed_password)
+    
+    @staticmethod
+    def _validate_import_chunk(chunk: List[StreamRecord], report: UserImportReportDTO) -> List[tuple]:
+        """Validate a chunk with UserDTO, dropping rows repeated inside the chunk"""
+        valid_users = []
+        seen_emails: Set[str] = set()
+        seen_usernames: Set[str] = set()
+        
+        for row, record in chunk:
+            if isinstance(record, str):
+                report.errors.append(UserImportRowErrorDTO(row=row, errors=[record]))
+                continue
+            try:
+                user = UserDTO.model_validate(record)
+            except ValidationError as e:
+                report.errors.append(UserImportRowErrorDTO(row=row, errors=format_validation_errors(e.errors())))
+                continue
+            if user.email in seen_emails:
+                report.errors.append(UserImportRowErrorDTO(row=row, errors=["Email repeated in the import"]))
+                continue
+            if user.username in seen_usernames:
+                report.errors.append(UserImportRowErrorDTO(row=row, errors=["Username repeated in the import"]))
+                continue
+            seen_emails.add(user.email)
+            seen_usernames.add(user.username)
+            valid_users.append((row, user))
+        
+        return valid_users
+    
+    @staticmethod
+    def _to_user_values(user_data: UserDTO, hashed_password: str) -> Dict[str, Any]:
+        """Column values for a new user row"""
+        return {
+            "first_name": user_data.first_name,
+            "last_name": user_data.last_name,
+            "username": user_data.username,
+            "email": user_data.email,
+            "hashed_password": hashed_password,
+            "is_active": user_data.is_active,
+            "is_admin": user_data.is_admin
+        }
@@ -0,0 +1,81 @@
+from typing import Iterable, Optional, Tuple
+from redis.exceptions import RedisError
+
+from app.infrastructure.database.repositories.async_user_repository import AsyncUserRepository
+from app.infrastructure.database.repositories.cached_user_repository import CachedUserRepository
+from app.infrastructure.settings.api_settings import settings
+from app.infrastructure.settings.redis_bloom_filter import RedisBloomFilter
+from app.infrastructure.settings.logger import logger
+from app.handlers.monitoring.cache_monitoring import AVAILABILITY_CHECKS
+from app.util.dtos.user import UserAvailabilityDTO
+
+username_filter = RedisBloomFilter(
+    "availability:username",
+    settings.AVAILABILITY_FILTER_CAPACITY,
+    settings.AVAILABILITY_FILTER_ERROR_RATE
+)
+email_filter = RedisBloomFilter(
+    "availability:email",
+    settings.AVAILABILITY_FILTER_CAPACITY,
+    settings.AVAILABILITY_FILTER_ERROR_RATE
+)
+
+
+class UserAvailabilityService:
+    """Answers username/email availability from the Bloom filters and only asks the
+    database when the filter reports a possible match. Sign-up uniqueness is still
+    enforced by the insert, so a stale filter can never create duplicates."""
+    
+    def __init__(self, cached_user_repository: CachedUserRepository):
+        self.cached_user_repository = cached_user_repository
+    
+    async def check(self, username: Optional[str] = None, email: Optional[str] = None) -> UserAvailabilityDTO:
+        """Availability of the given username and/or email"""
+        availability = UserAvailabilityDTO()
+        if username is not None:
+            availability.username_available = await self._is_available(
+                "username", username, username_filter, self.cached_user_repository.get_by_username
+            )
+        if email is not None:
+            availability.email_available = await self._is_available(
+                "email", email, email_filter, self.cached_user_repository.get_by_email
+            )
+        return availability
+    
+    async def _is_available(self, field: str, value: str, bloom_filter: RedisBloomFilter, lookup) -> bool:
+        try:
+            if not await bloom_filter.might_contain(value):
+                AVAILABILITY_CHECKS.labels(field=field, source="filter", available="true").inc()
+                return True
+        except RedisError as e:
+            logger.warning("Availability filter read failed", extra={"error": str(e)})
+        
+        available = await lookup(value) is None
+        AVAILABILITY_CHECKS.labels(field=field, source="database", available=str(available).lower()).inc()
+        return available
+
+
+async def register_identifiers(identifiers: Iterable[Tuple[str, str]]):
+    """Add new (username, email) pairs to the filters, never failing the caller"""
+    identifiers = list(identifiers)
+    try:
+        await username_filter.add(username for username, _ in identifiers)
+        await email_filter.add(email for _, email in identifiers)
+    except RedisError as e:
+        logger.error("Availability filter update failed", extra={"error": str(e)})
+
+
+async def rebuild_availability_filters(user_repository: AsyncUserRepository) -> bool:
+    """Add every existing user to the filters and mark them ready. Bits are only ever
+    set, so this is safe while other workers keep registering new users."""
+    filters = (username_filter, email_filter)
+    if all([await bloom_filter.is_ready() for bloom_filter in filters]):
+        return False
+    if not await username_filter.acquire_rebuild_lock(300):
+        return False
+    
+    async for identifiers in user_repository.iter_identifiers():
+        await register_identifiers(identifiers)
+    for bloom_filter in filters:
+        await bloom_filter.mark_ready()
+    return True
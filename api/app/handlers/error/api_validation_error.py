@@ -5,11 +5,11 @@ from app.util.mappers.api_response import ApiResponse
 from app.infrastructure.settings.logger import logger
 
 
-async def api_validation_error(request: Request, exc: RequestValidationError):
-    """Handler for Pydantic validation errors - returns JSONResponse directly"""
+def format_validation_errors(errors: list) -> list[str]:
+    """Turns Pydantic validation errors into readable messages"""
     error_messages = []
     
-    for error in exc.errors():
+    for error in errors:
         field = error["loc"][-1] if error["loc"] else "unknown field"
         error_type = error["type"]
         msg = error["msg"]
@@ -29,6 +29,13 @@ async def api_validation_error(request: Request, exc: RequestValidationError):
         else:
             error_messages.append(f"Error in field '{field}': {msg}")
     
+    return error_messages
+
+
+async def api_validation_error(request: Request, exc: RequestValidationError):
+    """Handler for Pydantic validation errors - returns JSONResponse directly"""
+    error_messages = format_validation_errors(exc.errors())
+    
     logger.warning("Validation error", extra={"errors": error_messages, "url": str(request.url)})
     
     return JSONResponse(
@@ -1,31 +1,46 @@
 import time
 import traceback
-from app.handlers.error.testerror import UnifiedValidationException
+from typing import Optional
 from prometheus_client import Counter, Histogram, Gauge
-from fastapi import Request
-from fastapi.exception_handlers import http_exception_handler
-from app.util.mappers.logger_mapper import LoggerMapper
-from app.handlers.error.response_error_exception import ResponseErrorException
-from app.util.dtos.extra_logger_information import HttpProcessInformation
+from starlette.datastructures import URL
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from app.infrastructure.settings.logger import logger
 from app.infrastructure.settings.api_settings import settings
+from app.util.functions.api_datetime import api_datetime
+from app.handlers.monitoring.request_log_sampler import RequestLogSampler
 
 # Métricas Prometheus
 REQUEST_COUNT = Counter(
-    'request_count', 
+    'request_count',
     'App Request Count',
     ['app_name', 'method', 'endpoint', 'http_status']
 )
 
 REQUEST_LATENCY = Histogram(
-    'request_latency_seconds', 
+    'request_latency_seconds',
     'Request latency',
-    ['app_name', 'endpoint']
+    ['app_name', 'endpoint'],
+    buckets=settings.REQUEST_LATENCY_BUCKETS
+)
+
+REQUEST_SIZE = Histogram(
+    'request_size_bytes',
+    'Request body size',
+    ['app_name', 'endpoint'],
+    buckets=settings.REQUEST_SIZE_BUCKETS
+)
+
+RESPONSE_SIZE = Histogram(
+    'response_size_bytes',
+    'Response body size',
+    ['app_name', 'endpoint'],
+    buckets=settings.RESPONSE_SIZE_BUCKETS
 )
 
 ACTIVE_USERS = Gauge(
     'active_users',
-    'Number of active users'
+    'Number of active users',
+    multiprocess_mode='livesum'
 )
 
 MARKET_API_CALLS = Counter(
@@ -34,50 +49,101 @@ MARKET_API_CALLS = Counter(
     ['api_provider', 'status']
 )
 
+# Etiquetas acotadas: una ruta sin coincidencia (404 de un crawler, por ejemplo)
+# no crea una serie nueva por cada path
+UNMATCHED_ENDPOINT = "unmatched"
+OTHER_METHOD = "OTHER"
+HTTP_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+
 class APIMonitoring:
-    def __init__(self, app_name: str = "portfolio_tracker"):
-        self.app_name = settings.APP_NAME
-    
-    async def __call__(self, request: Request, call_next):
-        start_time = time.time()
-       
+    """Pure ASGI middleware: the status comes from the http.response.start message
+    and the latency covers the whole response, body included. Unlike
+    app.middleware("http") it adds no task or stream per request.
+    Metrics are labeled with the matched route template, never the raw path.
+    Every request is counted but only the ones the sampler keeps are logged."""
+
+    def __init__(self, app: ASGIApp, app_name: str = settings.APP_NAME, log_sampler: Optional[RequestLogSampler] = None):
+        self.app = app
+        self.app_name = app_name
+        self.log_sampler = log_sampler or RequestLogSampler()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = 500
+        request_size = 0
+        response_size = 0
+
+        async def receive_with_size() -> Message:
+            nonlocal request_size
+            message = await receive()
+            if message["type"] == "http.request":
+                request_size += len(message.get("body", b""))
+            return message
+
+        async def send_with_status(message: Message):
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
         try:
-            print("Monitoring API request...")
-            response = await call_next(request)
-            print("API request processed.")
-            process_time = time.time() - start_time
-        
-            REQUEST_LATENCY.labels(
-                app_name=self.app_name,
-                endpoint=request.url.path
-            ).observe(process_time)
-        
-            REQUEST_COUNT.labels(
-                app_name=self.app_name,
-                method=request.method,
-                endpoint=request.url.path,
-                http_status=response.status_code
-            ).inc()
-            
-            latency = str(f"{process_time:.4f}s")
-            client_host = request.client.host if request.client else "unknown"
-            request_information = HttpProcessInformation(
-                method=request.method, url=str(request.url), 
-                client_host=client_host, 
-                user_agent= request.headers.get("user-agent", ""),
-                status=response.status_code, 
-                latency_ms=latency
-            ) 
-            extra_data = LoggerMapper(extra_data=request_information).to_log_format()
-            logger.info("📊 Monitoring api request", extra=extra_data)
-        
-            return response
-        except ResponseErrorException:
-            # Re-raise to let FastAPI's exception handler process it
-            raise
+            await self.app(scope, receive_with_size, send_with_status)
         except Exception as e:
             logger.error("❌ Error in API monitoring middleware", extra={"error": str(e), "stack_trace": traceback.format_exc()})
-            raise e
+            raise
+        finally:
+            self._record(scope, status_code, time.perf_counter() - start_time, request_size, response_size)
+
+    def _record(self, scope: Scope, status_code: int, process_time: float, request_size: int, response_size: int):
+        method = scope["method"]
+        # El router de FastAPI (o el rate limiter en sus 429) deja la ruta que coincidió en el scope
+        route = scope.get("route")
+        endpoint = getattr(route, "path", UNMATCHED_ENDPOINT)
+
+        REQUEST_LATENCY.labels(
+            app_name=self.app_name,
+            endpoint=endpoint
+        ).observe(process_time)
+
+        REQUEST_SIZE.labels(
+            app_name=self.app_name,
+            endpoint=endpoint
+        ).observe(request_size)
+
+        RESPONSE_SIZE.labels(
+            app_name=self.app_name,
+            endpoint=endpoint
+        ).observe(response_size)
+
+        REQUEST_COUNT.labels(
+            app_name=self.app_name,
+            method=method if method in HTTP_METHODS else OTHER_METHOD,
+            endpoint=endpoint,
+            http_status=status_code
+        ).inc()
+
+        if not self.log_sampler.should_log(endpoint, status_code, process_time):
+            return
 
-# Middleware para inyectar en FastAPI
-api_monitoring = APIMonitoring()
+        # Mismo formato que LoggerMapper(HttpProcessInformation) sin construir los modelos
+        client = scope.get("client")
+        user_agent = next((value.decode("latin-1") for name, value in scope["headers"] if name == b"user-agent"), "")
+        logger.info("📊 Monitoring api request", extra={
+            "timestamp": api_datetime.get_datetime_now(),
+            "data": {
+                "method": method,
+                "url": str(URL(scope=scope)),
+                "client_host": client[0] if client else "unknown",
+                "user_agent": user_agent,
+                "status": status_code,
+                "latency_ms": f"{process_time:.4f}s",
+            },
+            "data_type": "HttpProcessInformation",
+        })
@@ -0,0 +1,76 @@
+from prometheus_client import Counter, Gauge
+
+# Métricas Prometheus de las cachés
+CACHE_HITS = Counter(
+    'cache_hits',
+    'Cache lookups served from the cache',
+    ['cache']
+)
+
+CACHE_MISSES = Counter(
+    'cache_misses',
+    'Cache lookups that had to go to the source',
+    ['cache']
+)
+
+CACHE_ERRORS = Counter(
+    'cache_errors',
+    'Cache operations that failed and fell back to the source',
+    ['cache', 'operation']
+)
+
+AVAILABILITY_CHECKS = Counter(
+    'availability_checks',
+    'Username and email availability checks by where the answer came from',
+    ['field', 'source', 'available']
+)
+
+CACHE_TIER_HITS = Counter(
+    'cache_tier_hits',
+    'Two tier cache lookups answered by a tier (local or redis)',
+    ['cache', 'tier']
+)
+
+CACHE_TIER_MISSES = Counter(
+    'cache_tier_misses',
+    'Two tier cache lookups a tier could not answer (local or redis)',
+    ['cache', 'tier']
+)
+
+LOCAL_CACHE_ENTRIES = Gauge(
+    'local_cache_entries',
+    'Entries currently held in the in-process cache',
+    ['cache'],
+    multiprocess_mode='liveall'
+)
+
+LOCAL_CACHE_BYTES = Gauge(
+    'local_cache_bytes',
+    'Encoded bytes currently held in the in-process cache',
+    ['cache'],
+    multiprocess_mode='liveall'
+)
+
+LOCAL_CACHE_EVICTIONS = Counter(
+    'local_cache_evictions',
+    'In-process cache entries evicted by the entry or byte bound',
+    ['cache']
+)
+
+CACHE_INVALIDATIONS_RECEIVED = Counter(
+    'cache_invalidations_received',
+    'Invalidation messages from other workers applied to the in-process cache',
+    ['cache']
+)
+
+CACHE_COMPUTATIONS = Counter(
+    'cache_computations',
+    'Values computed by get_or_compute by reason (miss, early refresh or stale)',
+    ['reason']
+)
+
+CACHE_LOCK_WAITS = Counter(
+    'cache_lock_waits',
+    'get_or_compute calls that waited on another worker computing the same key',
+    ['outcome']
+)
@@ -0,0 +1,14 @@
+from prometheus_client import Counter, Gauge
+
+# Métricas Prometheus del pipeline de logs
+LOG_QUEUE_DEPTH = Gauge(
+    'log_queue_depth',
+    'Log records waiting to be written by the background writer',
+    multiprocess_mode='liveall'
+)
+
+LOG_RECORDS_DROPPED = Counter(
+    'log_records_dropped',
+    'Log records dropped because the log queue was full',
+    ['level']
+)
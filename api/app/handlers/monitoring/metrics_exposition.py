@@ -0,0 +1,98 @@
+import gzip
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from prometheus_client import CollectorRegistry, REGISTRY, multiprocess
+from prometheus_client.metrics import Gauge
+from prometheus_client.exposition import choose_encoder
+
+from app.infrastructure.settings.api_settings import settings
+
+OPENMETRICS = "application/openmetrics-text"
+
+
+def get_multiprocess_dir() -> Optional[str]:
+    """prometheus_client only writes per-process files when PROMETHEUS_MULTIPROC_DIR is
+    in the process environment at import time, so that is the only source used. A value
+    set only in .env would aggregate an empty folder and hide this worker's metrics:
+    startup fails instead."""
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if settings.PROMETHEUS_MULTIPROC_DIR and settings.PROMETHEUS_MULTIPROC_DIR != directory:
+        raise RuntimeError(
+            f"PROMETHEUS_MULTIPROC_DIR is '{settings.PROMETHEUS_MULTIPROC_DIR}' in the settings but "
+            f"'{directory}' in the process environment; export it before starting the server"
+        )
+    return directory
+
+
+MULTIPROC_DIR = get_multiprocess_dir()
+
+# Gauges que en modo multiproceso se actualizan con set() desde refresh_gauge_functions
+_refreshed_gauges: List[Tuple[Gauge, Callable[[], float]]] = []
+
+
+def set_gauge_function(gauge: Gauge, function: Callable[[], float]):
+    """Gauge.set_function, or in multiprocess mode a gauge refreshed by
+    refresh_gauge_functions: set_function values are never written to the
+    multiprocess folder and the scrape would show them as a fixed 0"""
+    if MULTIPROC_DIR:
+        _refreshed_gauges.append((gauge, function))
+    else:
+        gauge.set_function(function)
+
+
+def refresh_gauge_functions():
+    """Called periodically (SystemMetricsSampler) from the event loop thread"""
+    for gauge, function in _refreshed_gauges:
+        gauge.set(function())
+
+
+def build_metrics_registry() -> CollectorRegistry:
+    """With PROMETHEUS_MULTIPROC_DIR every worker writes its samples to that folder
+    and a fresh registry reads all of them, so one scrape sees the whole server"""
+    if not MULTIPROC_DIR:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=MULTIPROC_DIR)
+    return registry
+
+
+def mark_metrics_process_dead():
+    """Drop the live gauges of this worker from the multiprocess folder"""
+    if MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid(), path=MULTIPROC_DIR)
+
+
+class MetricsExposition:
+    """Renders the registry in the format the scraper asks for (Prometheus text or
+    OpenMetrics, gzip or not) and reuses each rendered payload for `cache_ttl` seconds.
+    Renders are serialized so a burst of scrapes renders once."""
+
+    def __init__(self, registry: CollectorRegistry, cache_ttl: float = settings.METRICS_CACHE_TTL):
+        self.registry = registry
+        self.cache_ttl = cache_ttl
+        self._cache: Dict[Tuple[bool, bool], Tuple[float, bytes, str]] = {}
+        self._lock = threading.Lock()
+
+    def render(self, accept: Optional[str], accept_encoding: Optional[str]) -> Tuple[bytes, str, bool]:
+        """(payload, content type, gzipped)"""
+        openmetrics = OPENMETRICS in (accept or "")
+        gzipped = "gzip" in (accept_encoding or "")
+        key = (openmetrics, gzipped)
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and time.monotonic() - cached[0] < self.cache_ttl:
+                return cached[1], cached[2], gzipped
+
+            encoder, content_type = choose_encoder(accept or "")
+            payload = encoder(self.registry)
+            if gzipped:
+                payload = gzip.compress(payload, compresslevel=6)
+            self._cache[key] = (time.monotonic(), payload, content_type)
+            return payload, content_type, gzipped
+
+
+# Instancia global
+metrics_exposition = MetricsExposition(build_metrics_registry())
@@ -0,0 +1,21 @@
+from prometheus_client import Counter, Histogram, Gauge
+
+# Métricas Prometheus del servicio de hashing de contraseñas
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    'password_hash_queue_depth',
+    'Password hash and verify operations waiting or running in the process pool',
+    multiprocess_mode='livesum'
+)
+
+PASSWORD_HASH_LATENCY = Histogram(
+    'password_hash_latency_seconds',
+    'Time from submitting a password operation to getting its result',
+    ['operation'],
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 1.5, 2.5, 5, 10)
+)
+
+PASSWORD_HASH_REJECTED = Counter(
+    'password_hash_rejected',
+    'Password operations rejected because the hashing queue was full',
+    ['operation']
+)
@@ -0,0 +1,39 @@
+from prometheus_client import Counter, Histogram, Gauge
+from sqlalchemy.engine import Engine
+
+from app.handlers.monitoring.metrics_exposition import set_gauge_function
+
+# Métricas Prometheus del pool de conexiones
+DB_POOL_CHECKED_OUT = Gauge(
+    'db_pool_checked_out_connections',
+    'Connections currently checked out from the pool',
+    ['pool'],
+    multiprocess_mode='liveall'
+)
+
+DB_POOL_OVERFLOW = Gauge(
+    'db_pool_overflow_connections',
+    'Overflow connections currently in use',
+    ['pool'],
+    multiprocess_mode='liveall'
+)
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    'db_pool_checkout_wait_seconds',
+    'Time spent waiting to check out a pooled connection',
+    ['pool'],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+
+DB_POOL_CHECKOUT_TIMEOUTS = Counter(
+    'db_pool_checkout_timeouts',
+    'Checkouts that gave up after pool_timeout',
+    ['pool']
+)
+
+
+def register_pool_metrics(engine: Engine, pool_name: str):
+    """Expose pool saturation gauges, evaluated at scrape time (or periodically in
+    multiprocess mode). The pool is looked up every time so engine.dispose() is handled."""
+    set_gauge_function(DB_POOL_CHECKED_OUT.labels(pool=pool_name), lambda: engine.pool.checkedout())
+    set_gauge_function(DB_POOL_OVERFLOW.labels(pool=pool_name), lambda: max(engine.pool.overflow(), 0))
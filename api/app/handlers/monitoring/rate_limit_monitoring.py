@@ -0,0 +1,13 @@
+from prometheus_client import Counter
+
+# Métricas Prometheus del rate limiter
+RATE_LIMIT_REJECTED = Counter(
+    'rate_limit_rejected',
+    'Requests rejected with 429 by rate limit rule',
+    ['rule']
+)
+
+RATE_LIMIT_ERRORS = Counter(
+    'rate_limit_errors',
+    'Requests let through because the rate limiter could not reach Redis in time'
+)
@@ -0,0 +1,20 @@
+from prometheus_client import Counter
+
+# Métricas Prometheus de los valores guardados en Redis
+REDIS_BYTES_WRITTEN = Counter(
+    'redis_bytes_written',
+    'Bytes sent to Redis as values, after compression and including the header',
+    ['codec']
+)
+
+REDIS_UNCOMPRESSED_BYTES_WRITTEN = Counter(
+    'redis_uncompressed_bytes_written',
+    'Bytes produced by the codec before compression',
+    ['codec']
+)
+
+REDIS_BYTES_READ = Counter(
+    'redis_bytes_read',
+    'Bytes of values read from Redis',
+    ['codec']
+)
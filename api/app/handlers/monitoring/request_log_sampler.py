@@ -0,0 +1,68 @@
+import random
+import time
+from typing import Dict
+from prometheus_client import Counter
+
+from app.infrastructure.settings.api_settings import settings
+
+# Métricas Prometheus del muestreo de logs de peticiones
+REQUEST_LOGS_WRITTEN = Counter(
+    'request_logs_written',
+    'Request log lines written by why they were kept (error, slow or sampled)',
+    ['reason']
+)
+
+REQUEST_LOGS_SUPPRESSED = Counter(
+    'request_logs_suppressed',
+    'Request log lines skipped by sampling or by the per second cap',
+    ['reason']
+)
+
+
+class RequestLogSampler:
+    """Decides whether a finished request gets its log line. Errors (status >=
+    error_status) and slow requests are always logged; the rest are sampled with
+    the rate of their route template and then capped at max_per_second lines."""
+
+    def __init__(
+        self,
+        default_rate: float = settings.REQUEST_LOG_SAMPLE_RATE,
+        route_rates: Dict[str, float] = settings.REQUEST_LOG_ROUTE_SAMPLE_RATES,
+        slow_threshold: float = settings.REQUEST_LOG_SLOW_THRESHOLD,
+        error_status: int = settings.REQUEST_LOG_ERROR_STATUS,
+        max_per_second: int = settings.REQUEST_LOG_MAX_PER_SECOND,
+    ):
+        self.default_rate = default_rate
+        self.route_rates = route_rates
+        self.slow_threshold = slow_threshold
+        self.error_status = error_status
+        self.max_per_second = max_per_second
+        self._window = 0
+        self._window_count = 0
+
+    def should_log(self, endpoint: str, status_code: int, latency: float) -> bool:
+        if status_code >= self.error_status:
+            REQUEST_LOGS_WRITTEN.labels(reason="error").inc()
+            return True
+        if latency >= self.slow_threshold:
+            REQUEST_LOGS_WRITTEN.labels(reason="slow").inc()
+            return True
+
+        rate = self.route_rates.get(endpoint, self.default_rate)
+        if rate < 1 and random.random() >= rate:
+            REQUEST_LOGS_SUPPRESSED.labels(reason="sampled").inc()
+            return False
+
+        if self.max_per_second:
+            # Ventana fija de un segundo
+            window = int(time.monotonic())
+            if window != self._window:
+                self._window = window
+                self._window_count = 0
+            if self._window_count >= self.max_per_second:
+                REQUEST_LOGS_SUPPRESSED.labels(reason="rate_limited").inc()
+                return False
+            self._window_count += 1
+
+        REQUEST_LOGS_WRITTEN.labels(reason="sampled").inc()
+        return True
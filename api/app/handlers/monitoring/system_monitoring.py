@@ -0,0 +1,39 @@
+from prometheus_client import Gauge
+
+# Métricas Prometheus del sistema y del proceso, las actualiza SystemMetricsSampler.
+# Los valores del sistema son iguales en todos los workers, los del proceso no
+SYSTEM_CPU_USAGE = Gauge(
+    'system_cpu_usage_percent',
+    'Host CPU usage over the last sampling interval',
+    multiprocess_mode='livemax'
+)
+
+SYSTEM_MEMORY_USAGE = Gauge(
+    'system_memory_usage_percent',
+    'Host memory in use',
+    multiprocess_mode='livemax'
+)
+
+SYSTEM_DISK_USAGE = Gauge(
+    'system_disk_usage_percent',
+    'Disk usage of the monitored path',
+    multiprocess_mode='livemax'
+)
+
+API_PROCESS_CPU_USAGE = Gauge(
+    'api_process_cpu_usage_percent',
+    'API worker CPU usage over the last sampling interval',
+    multiprocess_mode='liveall'
+)
+
+API_PROCESS_MEMORY_RSS = Gauge(
+    'api_process_memory_rss_bytes',
+    'API worker resident memory',
+    multiprocess_mode='liveall'
+)
+
+API_PROCESS_THREADS = Gauge(
+    'api_process_threads',
+    'API worker threads',
+    multiprocess_mode='liveall'
+)
@@ -0,0 +1,161 @@
+import math
+import time
+from typing import Optional, Tuple
+from fastapi import status
+from redis.exceptions import RedisError
+from starlette.datastructures import MutableHeaders
+from starlette.routing import BaseRoute, Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.handlers.monitoring.rate_limit_monitoring import RATE_LIMIT_REJECTED, RATE_LIMIT_ERRORS
+from app.infrastructure.settings.api_settings import settings
+from app.infrastructure.settings.logger import logger
+from app.infrastructure.settings.redis_client import AsyncRedisClient, rate_limit_redis_instance
+from app.util.functions.rate_limit import forwarded_client, parse_rate, parse_route_rule, route_rule_matches
+from app.util.mappers.api_response import ApiResponse, api_json_response
+
+DEFAULT_RULE = "default"
+
+# Token bucket atómico: recarga según el tiempo transcurrido (reloj de Redis,
+# el mismo para todos los workers) y consume un token si hay.
+# Devuelve {permitido, tokens restantes, ms hasta el próximo token}
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local tokens_per_ms = tonumber(ARGV[2]) / 1000
+local time = redis.call("TIME")
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "updated_at")
+local tokens = tonumber(bucket[1]) or capacity
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * tokens_per_ms)
+
+local allowed = 0
+local retry_after = 0
+if tokens >= 1 then
+    allowed = 1
+    tokens = tokens - 1
+else
+    retry_after = math.ceil((1 - tokens) / tokens_per_ms)
+end
+
+redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "updated_at", now)
+redis.call("PEXPIRE", KEYS[1], math.ceil(capacity / tokens_per_ms))
+return {allowed, math.floor(tokens), retry_after}
+"""
+
+
+class APIRateLimiter:
+    """Token bucket per client and route rule, checked with one Lua script call per request.
+    The most specific rule of RATE_LIMIT_ROUTES applies ('METHOD /prefix' or '/prefix'),
+    otherwise RATE_LIMIT_DEFAULT; RATE_LIMIT_CLIENTS overrides the rate for given clients.
+    Routes matching RATE_LIMIT_EXEMPT_ROUTES are never limited.
+    If Redis does not answer within RATE_LIMIT_REDIS_TIMEOUT requests are let through;
+    they are counted in rate_limit_errors and logged at most once per interval."""
+
+    def __init__(self, app: ASGIApp, client: AsyncRedisClient = rate_limit_redis_instance):
+        self.app = app
+        self.enabled = settings.RATE_LIMIT_ENABLED
+        self.client_header = settings.RATE_LIMIT_CLIENT_HEADER.lower().encode("latin-1") if settings.RATE_LIMIT_CLIENT_HEADER else None
+        self.trusted_proxies = settings.RATE_LIMIT_TRUSTED_PROXIES
+        self.default_rate = parse_rate(settings.RATE_LIMIT_DEFAULT)
+        self.client_rates = {client_id: parse_rate(rate) for client_id, rate in settings.RATE_LIMIT_CLIENTS.items()}
+        # Las reglas más largas primero, y con método antes que sin método
+        route_rules = [(rule, *parse_route_rule(rule), parse_rate(rate)) for rule, rate in settings.RATE_LIMIT_ROUTES.items()]
+        self.route_rules = sorted(route_rules, key=lambda rule: (len(rule[2]), rule[1] is not None), reverse=True)
+        self.exempt_rules = [parse_route_rule(rule) for rule in settings.RATE_LIMIT_EXEMPT_ROUTES]
+        self._take_token = client.redis_client.register_script(TOKEN_BUCKET_SCRIPT)
+        self.fail_open_log_interval = settings.RATE_LIMIT_FAIL_OPEN_LOG_INTERVAL
+        self._fail_open_count = 0
+        self._fail_open_logged_at = float("-inf")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not self.enabled or self._is_exempt(scope["method"], scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        rule, (limit, period) = self._match_rule(scope["method"], scope["path"])
+        client_id = self._client_id(scope)
+        limit, period = self.client_rates.get(client_id, (limit, period))
+
+        try:
+            allowed, remaining, retry_after_ms = await self._take_token(keys=[f"rate_limit:{rule}:{client_id}"], args=[limit, limit / period])
+        except RedisError as e:
+            RATE_LIMIT_ERRORS.inc()
+            self._log_fail_open(e)
+            await self.app(scope, receive, send)
+            return
+
+        if not allowed:
+            RATE_LIMIT_REJECTED.labels(rule=rule).inc()
+            # El 429 sale antes del router: se deja la ruta en el scope para que APIMonitoring la etiquete
+            route = self._matched_route(scope)
+            if route is not None:
+                scope["route"] = route
+            retry_after = max(1, math.ceil(retry_after_ms / 1000))
+            response = api_json_response(
+                ApiResponse[str](
+                    api_message="Too many requests",
+                    errors=[f"Limit of {limit} requests every {period} seconds exceeded, retry in {retry_after} seconds"]
+                ),
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS
+            )
+            response.headers["Retry-After"] = str(retry_after)
+            response.headers["X-RateLimit-Limit"] = str(limit)
+            response.headers["X-RateLimit-Remaining"] = str(remaining)
+            await response(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-RateLimit-Limit"] = str(limit)
+                headers["X-RateLimit-Remaining"] = str(remaining)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    @staticmethod
+    def _matched_route(scope: Scope) -> Optional[BaseRoute]:
+        """The route the router would pick: the first full match, else the first partial
+        one (wrong method)"""
+        router = getattr(scope.get("app"), "router", None)
+        partial = None
+        for route in getattr(router, "routes", []):
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route
+            if match == Match.PARTIAL and partial is None:
+                partial = route
+        return partial
+
+    def _log_fail_open(self, error: RedisError):
+        # Una línea por intervalo, no una por petición, mientras Redis no responde
+        self._fail_open_count += 1
+        now = time.monotonic()
+        if now - self._fail_open_logged_at >= self.fail_open_log_interval:
+            logger.warning(
+                "Rate limiter unavailable, requests let through",
+                extra={"error": str(error), "requests": self._fail_open_count}
+            )
+            self._fail_open_logged_at = now
+            self._fail_open_count = 0
+
+    def _is_exempt(self, method: str, path: str) -> bool:
+        return any(route_rule_matches(rule_method, prefix, method, path) for rule_method, prefix in self.exempt_rules)
+
+    def _match_rule(self, method: str, path: str) -> Tuple[str, Tuple[int, int]]:
+        for rule, rule_method, prefix, rate in self.route_rules:
+            if route_rule_matches(rule_method, prefix, method, path):
+                return rule, rate
+        return DEFAULT_RULE, self.default_rate
+
+    def _client_id(self, scope: Scope) -> str:
+        if self.client_header:
+            # Los valores de la izquierda los controla el cliente, solo se confía en los que añadieron nuestros proxies
+            values = [value.decode("latin-1") for name, value in scope["headers"] if name == self.client_header]
+            client_id = forwarded_client(values, self.trusted_proxies)
+            if client_id:
+                return client_id
+        client = scope.get("client")
+        return client[0] if client else "unknown"
@@ -0,0 +1,28 @@
+import time
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+from app.handlers.monitoring.pool_monitoring import DB_POOL_CHECKOUT_WAIT, DB_POOL_CHECKOUT_TIMEOUTS
+
+
+class InstrumentedPoolMixin:
+    """Times every checkout and counts the ones that hit pool_timeout"""
+    pool_name: str = "default"
+
+    def _do_get(self):
+        start_time = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            DB_POOL_CHECKOUT_TIMEOUTS.labels(pool=self.pool_name).inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_WAIT.labels(pool=self.pool_name).observe(time.perf_counter() - start_time)
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    pool_name = "sync"
+
+
+class InstrumentedAsyncQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pool_name = "async"
@@ -1,16 +1,45 @@
-from sqlalchemy import create_engine
+from contextlib import AsyncExitStack
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.infrastructure.settings.api_settings import settings
 from app.handlers.error.response_error_exception import ResponseErrorException
+from app.handlers.monitoring.pool_monitoring import register_pool_metrics
+from app.infrastructure.database.adapters.instrumented_pool import InstrumentedQueuePool, InstrumentedAsyncQueuePool
 
 database_engine = create_engine(
     settings.DATABASE_URL,
+    poolclass=InstrumentedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
     pool_pre_ping=True,
     echo=settings.DEBUG == "true"
 )
 
+async_database_engine = create_async_engine(
+    settings.async_database_url,
+    poolclass=InstrumentedAsyncQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=True,
+    echo=settings.DEBUG == "true"
+)
+
+register_pool_metrics(database_engine, InstrumentedQueuePool.pool_name)
+register_pool_metrics(async_database_engine.sync_engine, InstrumentedAsyncQueuePool.pool_name)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=database_engine)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_database_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
 Base = declarative_base()
 
 def get_conection_database():
@@ -23,5 +52,27 @@ def get_conection_database():
     finally:
         db.close()
 
+async def get_async_conection_database():
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception:
+            await db.rollback()
+            raise
+
+async def warm_up_database_pool(connections: int) -> int:
+    """Open and validate pooled connections before serving traffic.
+    All connections are held at once so the pool really creates them."""
+    from app.infrastructure.database.repositories.async_user_repository import AsyncUserRepository
+
+    connections = min(connections, settings.DB_POOL_SIZE)
+    async with AsyncExitStack() as stack:
+        for _ in range(connections):
+            connection = await stack.enter_async_context(async_database_engine.connect())
+            await connection.execute(text("SELECT 1"))
+            async with AsyncSession(bind=connection) as db:
+                await AsyncUserRepository(db).warm_up()
+    return connections
+
 def create_tables():
     Base.metadata.create_all(bind=database_engine)
@@ -1,4 +1,6 @@
 # Database repositories module
 from app.infrastructure.database.repositories.user_repository import UserRepository
+from app.infrastructure.database.repositories.async_user_repository import AsyncUserRepository
+from app.infrastructure.database.repositories.cached_user_repository import CachedUserRepository
 
-__all__ = ["UserRepository"]
+__all__ = ["UserRepository", "AsyncUserRepository", "CachedUserRepository"]
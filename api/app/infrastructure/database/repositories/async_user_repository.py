@@ -0,0 +1,187 @@
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Set, Tuple, AsyncIterator
+from uuid import UUID, uuid4
+from sqlalchemy import any_, bindparam, func, insert, select, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert, UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+
+from app.core.interfaces.repository import AsyncBaseRepository
+from app.infrastructure.database.schemas.user import UserSchema
+from app.handlers.error.response_error_exception import ResponseErrorException
+from app.util.constants.database_constraints import USER_CONSTRAINT_ERRORS
+from app.util.functions.database_errors import get_constraint_name
+from app.util.mappers.user_mapper import USER_RESPONSE_FIELDS
+
+
+class AsyncUserRepository(AsyncBaseRepository[UserSchema]):
+    """Async repository for User database operations"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def create(self, entity: UserSchema) -> UserSchema:
+        """Create a new user with a single INSERT ... RETURNING round trip"""
+        values = {
+            column.key: getattr(entity, column.key)
+            for column in UserSchema.__table__.columns
+            if getattr(entity, column.key) is not None
+        }
+        try:
+            result = await self.db.execute(insert(UserSchema).values(**values).returning(UserSchema))
+            created_user = result.scalar_one()
+            await self.db.commit()
+            return created_user
+        except IntegrityError as e:
+            await self.db.rollback()
+            constraint_name = get_constraint_name(e)
+            if constraint_name in USER_CONSTRAINT_ERRORS:
+                raise ResponseErrorException.conflict(USER_CONSTRAINT_ERRORS[constraint_name])
+            raise ResponseErrorException.bad_request("Error creating user", str(e))
+    
+    async def bulk_create(self, users: List[Dict[str, Any]]) -> Set[str]:
+        """Insert many users with multi-row INSERT ... ON CONFLICT DO NOTHING.
+        Returns the emails of the rows that were actually inserted."""
+        users_table = UserSchema.__table__
+        statement = pg_insert(users_table).on_conflict_do_nothing().returning(users_table.c.email)
+        try:
+            result = await self.db.execute(statement, users)
+            inserted_emails = set(result.scalars().all())
+            await self.db.commit()
+            return inserted_emails
+        except IntegrityError as e:
+            await self.db.rollback()
+            raise ResponseErrorException.bad_request("Error importing users", str(e))
+    
+    async def get_existing_emails(self, emails: List[str]) -> Set[str]:
+        """Return which of the given emails are already registered"""
+        result = await self.db.execute(select(UserSchema.email).where(UserSchema.email.in_(emails)))
+        return set(result.scalars().all())
+    
+    async def get_by_id(self, id: UUID) -> Optional[UserSchema]:
+        """Get user by UUID"""
+        return await self.db.get(UserSchema, id)
+    
+    async def get_many(self, ids: List[UUID]) -> List[UserSchema]:
+        """Get every existing user among the given UUIDs with one id = ANY(:ids) query"""
+        if not ids:
+            return []
+        # A single array parameter keeps the SQL text, and its prepared statement, the same for any number of ids
+        ids_parameter = bindparam("ids", ids, type_=ARRAY(PG_UUID(as_uuid=True)))
+        result = await self.db.execute(select(UserSchema).where(UserSchema.id == any_(ids_parameter)))
+        return list(result.scalars().all())
+    
+    async def get_by_email(self, email: str) -> Optional[UserSchema]:
+        """Get user by email address"""
+        result = await self.db.execute(select(UserSchema).where(UserSchema.email == email))
+        return result.scalars().first()
+    
+    async def get_by_username(self, username: str) -> Optional[UserSchema]:
+        """Get user by username"""
+        result = await self.db.execute(select(UserSchema).where(UserSchema.username == username))
+        return result.scalars().first()
+    
+    async def get_all(self, skip: int = 0, limit: int = 100) -> List[UserSchema]:
+        """Get all users with pagination"""
+        result = await self.db.execute(select(UserSchema).offset(skip).limit(limit))
+        return list(result.scalars().all())
+    
+    async def count_by_status(self) -> Dict[str, int]:
+        """Total, active and admin users counted in a single scan"""
+        statement = select(
+            func.count().label("total"),
+            func.count().filter(UserSchema.is_active.is_(True)).label("active"),
+            func.count().filter(UserSchema.is_admin.is_(True)).label("admins"),
+        )
+        result = await self.db.execute(statement)
+        return dict(result.one()._mapping)
+    
+    async def get_page_rows(self, after: Optional[Tuple[datetime, UUID]] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Get the response columns of users ordered by (created_at, id) starting after the given keyset.
+        Plain dicts are returned so list endpoints can encode them without ORM objects or DTOs."""
+        columns = [getattr(UserSchema, field) for field in USER_RESPONSE_FIELDS]
+        statement = select(*columns).order_by(UserSchema.created_at, UserSchema.id).limit(limit)
+        if after:
+            statement = statement.where(tuple_(UserSchema.created_at, UserSchema.id) > tuple_(*after))
+        result = await self.db.execute(statement)
+        return [dict(row) for row in result.mappings()]
+    
+    async def iter_response_rows(self, batch_size: int = 2000) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Stream the response columns of every user in batches with a server-side cursor"""
+        columns = [getattr(UserSchema, field) for field in USER_RESPONSE_FIELDS]
+        statement = select(*columns).order_by(UserSchema.created_at, UserSchema.id).execution_options(yield_per=batch_size)
+        result = await self.db.stream(statement)
+        async for partition in result.mappings().partitions():
+            yield [dict(row) for row in partition]
+    
+    async def iter_identifiers(self, batch_size: int = 5000) -> AsyncIterator[List[Tuple[str, str]]]:
+        """Stream (username, email) of every user in batches with a server-side cursor"""
+        statement = select(UserSchema.username, UserSchema.email).execution_options(yield_per=batch_size)
+        result = await self.db.stream(statement)
+        async for partition in result.partitions():
+            yield [(username, email) for username, email in partition]
+    
+    async def update(self, id: UUID, entity: UserSchema) -> Optional[UserSchema]:
+        """Update an existing user with the non empty columns of entity"""
+        values = {
+            column.key: getattr(entity, column.key)
+            for column in UserSchema.__table__.columns
+            if column.key != "id" and getattr(entity, column.key) is not None
+        }
+        return await self.partial_update(id, values)
+    
+    async def partial_update(self, id: UUID, values: Dict[str, Any]) -> Optional[UserSchema]:
+        """Update only the given columns with a single UPDATE ... RETURNING"""
+        users = await self.bulk_update([id], values)
+        return users[0] if users else None
+    
+    async def bulk_update(self, ids: List[UUID], values: Dict[str, Any]) -> List[UserSchema]:
+        """Set the same columns on every given user with one UPDATE ... WHERE id IN ... RETURNING"""
+        columns = UserSchema.__table__.columns.keys()
+        values = {key: value for key, value in values.items() if key in columns and key != "id"}
+        if not values:
+            result = await self.db.execute(select(UserSchema).where(UserSchema.id.in_(ids)))
+            return list(result.scalars().all())
+        
+        statement = (
+            update(UserSchema)
+            .where(UserSchema.id.in_(ids))
+            .values(**values)
+            .returning(UserSchema)
+            .execution_options(populate_existing=True)
+        )
+        try:
+            result = await self.db.execute(statement)
+            updated_users = list(result.scalars().all())
+            await self.db.commit()
+            return updated_users
+        except IntegrityError as e:
+            await self.db.rollback()
+            constraint_name = get_constraint_name(e)
+            if constraint_name in USER_CONSTRAINT_ERRORS:
+                raise ResponseErrorException.conflict(USER_CONSTRAINT_ERRORS[constraint_name])
+            raise ResponseErrorException.bad_request("Error updating user", str(e))
+    
+    async def delete(self, id: UUID) -> bool:
+        """Delete user by ID"""
+        user = await self.get_by_id(id)
+        if not user:
+            return False
+        
+        await self.db.delete(user)
+        await self.db.commit()
+        return True
+    
+    async def deactivate(self, id: UUID) -> Optional[UserSchema]:
+        """Soft delete - deactivate user instead of deleting"""
+        return await self.partial_update(id, {"is_active": False})
+    
+    async def bulk_deactivate(self, ids: List[UUID]) -> List[UserSchema]:
+        """Soft delete many users with one statement"""
+        return await self.bulk_update(ids, {"is_active": False})
+    
+    async def warm_up(self):
+        """Run the hot lookups once so their SQL is compiled and prepared on this connection"""
+        await self.get_by_id(uuid4())
+        await self.get_by_email("")
+        await self.get_by_username("")
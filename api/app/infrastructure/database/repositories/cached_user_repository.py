@@ -0,0 +1,128 @@
+from typing import Optional, Any, Awaitable, Callable, Dict, List
+from uuid import UUID
+from redis.exceptions import RedisError
+
+from app.infrastructure.database.repositories.async_user_repository import AsyncUserRepository
+from app.infrastructure.database.schemas.user import UserSchema
+from app.infrastructure.settings.api_settings import settings
+from app.infrastructure.settings.two_tier_cache import TwoTierCache, two_tier_cache
+from app.infrastructure.settings.logger import logger
+from app.handlers.monitoring.cache_monitoring import CACHE_HITS, CACHE_MISSES, CACHE_ERRORS
+from app.util.dtos.user import UserResponseDTO
+from app.util.mappers.user_mapper import to_user_response_dto
+
+CACHE_NAME = "user"
+
+
+class CachedUserRepository:
+    """Read-through two tier (in-process + Redis) cache of UserResponseDTOs in front of
+    AsyncUserRepository. Writes go to the database first and then drop the id, email
+    and username keys in Redis and in every worker's in-process cache."""
+    
+    def __init__(self, repository: AsyncUserRepository, cache: TwoTierCache = two_tier_cache, ttl: int = settings.USER_CACHE_TTL):
+        self.repository = repository
+        self.cache = cache
+        self.ttl = ttl
+    
+    async def get_by_id(self, id: UUID) -> Optional[UserResponseDTO]:
+        """Get user by UUID"""
+        return await self._read_through(self._key("id", id), lambda: self.repository.get_by_id(id))
+    
+    async def get_by_email(self, email: str) -> Optional[UserResponseDTO]:
+        """Get user by email address"""
+        return await self._read_through(self._key("email", email), lambda: self.repository.get_by_email(email))
+    
+    async def get_by_username(self, username: str) -> Optional[UserResponseDTO]:
+        """Get user by username"""
+        return await self._read_through(self._key("username", username), lambda: self.repository.get_by_username(username))
+    
+    async def update(self, id: UUID, entity: UserSchema) -> Optional[UserSchema]:
+        """Update an existing user and invalidate its old and new keys"""
+        # The session identity map keeps the repository from loading the row twice
+        existing_user = await self.repository.get_by_id(id)
+        previous_keys = self._keys(existing_user) if existing_user else []
+        updated_user = await self.repository.update(id, entity)
+        if updated_user:
+            await self._invalidate(previous_keys + self._keys(updated_user))
+        return updated_user
+    
+    async def partial_update(self, id: UUID, values: Dict[str, Any]) -> Optional[UserSchema]:
+        """Update the given columns and invalidate the user's keys.
+        The old row is only read when the email or username change."""
+        previous_keys = []
+        if "email" in values or "username" in values:
+            existing_user = await self.repository.get_by_id(id)
+            if not existing_user:
+                return None
+            previous_keys = self._keys(existing_user)
+        updated_user = await self.repository.partial_update(id, values)
+        if updated_user:
+            await self._invalidate(previous_keys + self._keys(updated_user))
+        return updated_user
+    
+    async def bulk_deactivate(self, ids: List[UUID]) -> List[UserSchema]:
+        """Soft delete many users and invalidate all their keys"""
+        users = await self.repository.bulk_deactivate(ids)
+        await self._invalidate([key for user in users for key in self._keys(user)])
+        return users
+    
+    async def deactivate(self, id: UUID) -> Optional[UserSchema]:
+        """Soft delete the user and invalidate its keys"""
+        user = await self.repository.deactivate(id)
+        if user:
+            await self._invalidate(self._keys(user))
+        return user
+    
+    async def delete(self, id: UUID) -> bool:
+        """Delete the user and invalidate its keys"""
+        user = await self.repository.get_by_id(id)
+        if not user:
+            return False
+        keys = self._keys(user)
+        deleted = await self.repository.delete(id)
+        await self._invalidate(keys)
+        return deleted
+    
+    async def _read_through(self, key: str, load: Callable[[], Awaitable[Optional[UserSchema]]]) -> Optional[UserResponseDTO]:
+        try:
+            cached_user, version = await self.cache.get_with_version(key)
+        except RedisError as e:
+            CACHE_ERRORS.labels(cache=CACHE_NAME, operation="get").inc()
+            logger.warning("User cache read failed", extra={"error": str(e)})
+            cached_user, version = None, None
+        
+        if cached_user is not None:
+            CACHE_HITS.labels(cache=CACHE_NAME).inc()
+            return UserResponseDTO.model_validate(cached_user)
+        
+        CACHE_MISSES.labels(cache=CACHE_NAME).inc()
+        user = await load()
+        if not user:
+            return None
+        
+        user_dto = to_user_response_dto(user)
+        if version is None:
+            return user_dto
+        try:
+            # Skipped if the user was invalidated while it was being read from the database
+            await self.cache.fill_many(dict.fromkeys(self._keys(user), user_dto.model_dump(mode="json")), version, expire=self.ttl)
+        except RedisError as e:
+            CACHE_ERRORS.labels(cache=CACHE_NAME, operation="set").inc()
+            logger.warning("User cache write failed", extra={"error": str(e)})
+        return user_dto
+    
+    async def _invalidate(self, keys: List[str]):
+        if not keys:
+            return
+        try:
+            await self.cache.delete_many(list(set(keys)))
+        except RedisError as e:
+            CACHE_ERRORS.labels(cache=CACHE_NAME, operation="delete").inc()
+            logger.error("User cache invalidation failed", extra={"error": str(e), "keys": keys})
+    
+    @staticmethod
+    def _key(field: str, value: Any) -> str:
+        return f"user:{field}:{value}"
+    
+    def _keys(self, user: UserSchema) -> List[str]:
+        return [self._key("id", user.id), self._key("email", user.email), self._key("username", user.username)]
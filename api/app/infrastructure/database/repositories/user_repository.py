@@ -1,11 +1,14 @@
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from uuid import UUID
+from sqlalchemy import insert, select, update
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
 from app.core.interfaces.repository import BaseRepository
 from app.infrastructure.database.schemas.user import UserSchema
 from app.handlers.error.response_error_exception import ResponseErrorException
+from app.util.constants.database_constraints import USER_CONSTRAINT_ERRORS
+from app.util.functions.database_errors import get_constraint_name
 
 
 class UserRepository(BaseRepository[UserSchema]):
@@ -15,24 +18,34 @@ class UserRepository(BaseRepository[UserSchema]):
         self.db = db
     
     def create(self, entity: UserSchema) -> UserSchema:
-        """Create a new user in the database"""
+        """Create a new user with a single INSERT ... RETURNING round trip"""
+        values = {
+            column.key: getattr(entity, column.key)
+            for column in UserSchema.__table__.columns
+            if getattr(entity, column.key) is not None
+        }
         try:
-            self.db.add(entity)
+            result = self.db.execute(insert(UserSchema).values(**values).returning(UserSchema))
+            created_user = result.scalar_one()
             self.db.commit()
-            self.db.refresh(entity)
-            return entity
+            return created_user
         except IntegrityError as e:
             self.db.rollback()
-            if "email" in str(e.orig):
-                raise ResponseErrorException.conflict("Email already registered")
-            if "username" in str(e.orig):
-                raise ResponseErrorException.conflict("Username already taken")
+            constraint_name = get_constraint_name(e)
+            if constraint_name in USER_CONSTRAINT_ERRORS:
+                raise ResponseErrorException.conflict(USER_CONSTRAINT_ERRORS[constraint_name])
             raise ResponseErrorException.bad_request("Error creating user", str(e))
     
     def get_by_id(self, id: UUID) -> Optional[UserSchema]:
         """Get user by UUID"""
         return self.db.query(UserSchema).filter(UserSchema.id == id).first()
     
+    def get_many(self, ids: List[UUID]) -> List[UserSchema]:
+        """Get every existing user among the given UUIDs with one query"""
+        if not ids:
+            return []
+        return self.db.query(UserSchema).filter(UserSchema.id.in_(ids)).all()
+    
     def get_by_email(self, email: str) -> Optional[UserSchema]:
         """Get user by email address"""
         return self.db.query(UserSchema).filter(UserSchema.email == email).first()
@@ -46,21 +59,44 @@ class UserRepository(BaseRepository[UserSchema]):
         return self.db.query(UserSchema).offset(skip).limit(limit).all()
     
     def update(self, id: UUID, entity: UserSchema) -> Optional[UserSchema]:
-        """Update an existing user"""
-        existing_user = self.get_by_id(id)
-        if not existing_user:
-            return None
-        
-        for key, value in entity.__dict__.items():
-            if not key.startswith('_') and value is not None:
-                setattr(existing_user, key, value)
+        """Update an existing user with the non empty columns of entity"""
+        values = {
+            column.key: getattr(entity, column.key)
+            for column in UserSchema.__table__.columns
+            if column.key != "id" and getattr(entity, column.key) is not None
+        }
+        return self.partial_update(id, values)
+    
+    def partial_update(self, id: UUID, values: Dict[str, Any]) -> Optional[UserSchema]:
+        """Update only the given columns with a single UPDATE ... RETURNING"""
+        users = self.bulk_update([id], values)
+        return users[0] if users else None
+    
+    def bulk_update(self, ids: List[UUID], values: Dict[str, Any]) -> List[UserSchema]:
+        """Set the same columns on every given user with one UPDATE ... WHERE id IN ... RETURNING"""
+        columns = UserSchema.__table__.columns.keys()
+        values = {key: value for key, value in values.items() if key in columns and key != "id"}
+        if not values:
+            result = self.db.execute(select(UserSchema).where(UserSchema.id.in_(ids)))
+            return list(result.scalars().all())
         
+        statement = (
+            update(UserSchema)
+            .where(UserSchema.id.in_(ids))
+            .values(**values)
+            .returning(UserSchema)
+            .execution_options(populate_existing=True)
+        )
         try:
+            result = self.db.execute(statement)
+            updated_users = list(result.scalars().all())
             self.db.commit()
-            self.db.refresh(existing_user)
-            return existing_user
+            return updated_users
         except IntegrityError as e:
             self.db.rollback()
+            constraint_name = get_constraint_name(e)
+            if constraint_name in USER_CONSTRAINT_ERRORS:
+                raise ResponseErrorException.conflict(USER_CONSTRAINT_ERRORS[constraint_name])
             raise ResponseErrorException.bad_request("Error updating user", str(e))
     
     def delete(self, id: UUID) -> bool:
@@ -75,11 +111,8 @@ class UserRepository(BaseRepository[UserSchema]):
     
     def deactivate(self, id: UUID) -> Optional[UserSchema]:
         """Soft delete - deactivate user instead of deleting"""
-        user = self.get_by_id(id)
-        if not user:
-            return None
-        
-        user.is_active = False
-        self.db.commit()
-        self.db.refresh(user)
-        return user
+        return self.partial_update(id, {"is_active": False})
+    
+    def bulk_deactivate(self, ids: List[UUID]) -> List[UserSchema]:
+        """Soft delete many users with one statement"""
+        return self.bulk_update(ids, {"is_active": False})
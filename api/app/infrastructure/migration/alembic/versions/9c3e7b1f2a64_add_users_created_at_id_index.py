@@ -0,0 +1,28 @@
+"""add users created_at id index
+
+Revision ID: 9c3e7b1f2a64
+Revises: 5dd91dfbdc35
+Create Date: 2026-10-18 10:12:31.402114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c3e7b1f2a64'
+down_revision = '5dd91dfbdc35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keyset pagination needs created_at on every row
+    op.execute("UPDATE users SET created_at = COALESCE(updated_at, now() at time zone 'utc') WHERE created_at IS NULL")
+    op.alter_column('users', 'created_at', existing_type=sa.DateTime(), nullable=False)
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_users_created_at_id', table_name='users')
+    op.alter_column('users', 'created_at', existing_type=sa.DateTime(), nullable=True)
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, List, Optional
 
 class Settings(BaseSettings):
     
@@ -18,6 +18,34 @@ class Settings(BaseSettings):
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
     REDIS_PASSWORD: Optional[str] = None
+    REDIS_MAX_CONNECTIONS: int = 50
+    # Seconds to wait for a free pooled connection, to connect and to read a reply
+    REDIS_POOL_TIMEOUT: float = 1.0
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 1.0
+    REDIS_SOCKET_TIMEOUT: float = 2.0
+    USER_CACHE_TTL: int = 300
+    USER_STATS_CACHE_TTL: int = 60
+    USER_STATS_STALE_TTL: int = 300
+    
+    # Redis values (json, orjson, msgpack, numpy)
+    REDIS_DEFAULT_CODEC: str = "msgpack"
+    REDIS_COMPRESSION_THRESHOLD: int = 1024
+    REDIS_COMPRESSION_LEVEL: int = 6
+    
+    # In-process cache in front of Redis
+    LOCAL_CACHE_MAX_ENTRIES: int = 10_000
+    LOCAL_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    LOCAL_CACHE_TTL: int = 30
+    CACHE_INVALIDATION_CHANNEL: str = "cache:invalidate"
+    
+    # get_or_compute stampede protection
+    CACHE_LOCK_TIMEOUT: float = 10
+    CACHE_LOCK_POLL_INTERVAL: float = 0.05
+    CACHE_EARLY_EXPIRATION_BETA: float = 1.0
+    
+    # Username and email availability filter
+    AVAILABILITY_FILTER_CAPACITY: int = 1_000_000
+    AVAILABILITY_FILTER_ERROR_RATE: float = 0.01
    
     SECRET_KEY: Optional[str] = None
     ALGORITHM: Optional[str] = None
@@ -28,12 +56,90 @@ class Settings(BaseSettings):
     
     DATABASE_URL: Optional[str] = None
     
+    # Database pool
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_WARMUP_CONNECTIONS: int = 5
+    
+    # Startup warm-up retries (seconds, the delay doubles up to the max)
+    WARMUP_RETRY_INITIAL_DELAY: float = 1.0
+    WARMUP_RETRY_MAX_DELAY: float = 30.0
+    
+    # Password hashing
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    
+    # Bulk user import
+    USER_IMPORT_CHUNK_SIZE: int = 1000
+    
+    # Users export
+    USER_EXPORT_BATCH_SIZE: int = 2000
+    
+    # Logging queue; when it is full records are dropped ("drop") or the caller
+    # waits up to LOG_QUEUE_BLOCK_TIMEOUT seconds before dropping them ("block")
+    LOG_QUEUE_SIZE: int = 10_000
+    LOG_QUEUE_FULL_POLICY: str = "drop"
+    LOG_QUEUE_BLOCK_TIMEOUT: float = 0.1
+    LOG_BATCH_SIZE: int = 256
+    
+    # Metrics exposition; PROMETHEUS_MULTIPROC_DIR is read from the process environment
+    # (prometheus_client reads it when it is imported), startup fails if this differs
+    PROMETHEUS_MULTIPROC_DIR: Optional[str] = None
+    METRICS_CACHE_TTL: float = 1.0
+    
+    # System metrics sampler; health checks and gauges read its last snapshot
+    SYSTEM_METRICS_INTERVAL: float = 5.0
+    SYSTEM_METRICS_DISK_PATH: str = "/"
+    
+    # Request log sampling; sample rates are keyed by route template ("unmatched" for 404s)
+    REQUEST_LOG_SAMPLE_RATE: float = 1.0
+    REQUEST_LOG_ROUTE_SAMPLE_RATES: Dict[str, float] = {
+        "/monitoring/health": 0.0,
+        "/monitoring/ready": 0.0,
+        "/monitoring/metrics": 0.0,
+    }
+    REQUEST_LOG_SLOW_THRESHOLD: float = 1.0
+    REQUEST_LOG_ERROR_STATUS: int = 500
+    REQUEST_LOG_MAX_PER_SECOND: int = 100
+    
+    # Request metrics histograms
+    REQUEST_LATENCY_BUCKETS: List[float] = [0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1, 2.5, 5, 10]
+    REQUEST_SIZE_BUCKETS: List[float] = [100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+    RESPONSE_SIZE_BUCKETS: List[float] = [100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000]
+    
+    # Rate limiting ("<requests>/<second|minute|hour|day>"), rules are "METHOD /prefix" or "/prefix"
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_DEFAULT: str = "300/minute"
+    RATE_LIMIT_ROUTES: Dict[str, str] = {
+        "POST /user/create-user": "10/minute",
+        "POST /user/import": "5/minute",
+        "/monitoring": "60/minute",
+    }
+    # Never limited: probes and scrapes share a source IP across pods and a 429 marks the pod unready
+    RATE_LIMIT_EXEMPT_ROUTES: List[str] = ["/monitoring/health", "/monitoring/ready", "/monitoring/metrics"]
+    RATE_LIMIT_CLIENTS: Dict[str, str] = {}
+    # Header with the client address (e.g. X-Forwarded-For) and how many proxies in front
+    # of the API append to it; the client is that many values from the right
+    RATE_LIMIT_CLIENT_HEADER: Optional[str] = None
+    RATE_LIMIT_TRUSTED_PROXIES: int = 1
+    # Dedicated Redis pool of the limiter; past the timeout (seconds) requests are let through
+    RATE_LIMIT_REDIS_MAX_CONNECTIONS: int = 50
+    RATE_LIMIT_REDIS_TIMEOUT: float = 0.25
+    RATE_LIMIT_FAIL_OPEN_LOG_INTERVAL: float = 10.0
+    
     @property
     def database_url(self) -> str:
         if self.DATABASE_URL:
             return self.DATABASE_URL
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
     
+    @property
+    def async_database_url(self) -> str:
+        _, address = self.database_url.split("://", 1)
+        return f"postgresql+asyncpg://{address}"
+    
     
     class Config:
         env_file = ".env"
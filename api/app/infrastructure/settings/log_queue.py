@@ -0,0 +1,131 @@
+import copy
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, RotatingFileHandler
+from typing import List
+
+from app.handlers.monitoring.logging_monitoring import LOG_QUEUE_DEPTH, LOG_RECORDS_DROPPED
+
+DROP_POLICY = "drop"
+BLOCK_POLICY = "block"
+
+
+class BoundedQueueHandler(QueueHandler):
+    """Puts records on a bounded queue instead of writing them. When the queue is
+    full the record is dropped right away ("drop") or after waiting up to
+    `block_timeout` seconds for the writer thread to catch up ("block")."""
+
+    def __init__(self, log_queue: queue.Queue, full_policy: str = DROP_POLICY, block_timeout: float = 0.1):
+        if full_policy not in (DROP_POLICY, BLOCK_POLICY):
+            raise ValueError(f"Unknown log queue policy '{full_policy}', expected '{DROP_POLICY}' or '{BLOCK_POLICY}'")
+        super().__init__(log_queue)
+        self.full_policy = full_policy
+        self.block_timeout = block_timeout
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # A diferencia de QueueHandler.prepare no formatea aquí: los formatters
+        # corren en el hilo de escritura y necesitan los campos del record
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            if self.full_policy == BLOCK_POLICY:
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.labels(level=record.levelname).inc()
+
+
+class BatchHandlerMixin:
+    """Writes a whole batch of records with one write and one flush"""
+
+    def emit_batch(self, records: List[logging.LogRecord]):
+        records = [record for record in records if record.levelno >= self.level and self.filter(record)]
+        if not records:
+            return
+        try:
+            text = "".join(self.format(record) + self.terminator for record in records)
+            with self.lock:
+                self.write_batch(text)
+        except Exception:
+            self.handleError(records[0])
+
+    def write_batch(self, text: str):
+        self.stream.write(text)
+        self.flush()
+
+
+class BatchStreamHandler(BatchHandlerMixin, logging.StreamHandler):
+    pass
+
+
+class BatchRotatingFileHandler(BatchHandlerMixin, RotatingFileHandler):
+    """RotatingFileHandler that checks the size once per batch instead of once per record"""
+
+    def write_batch(self, text: str):
+        if self.stream is None:
+            self.stream = self._open()
+        if self.maxBytes > 0:
+            # tell() es un offset en bytes: el lote se mide en bytes, no en caracteres
+            position = self.stream.tell()
+            if position and position + len(text.encode(self.encoding or "utf-8")) >= self.maxBytes:
+                self.doRollover()
+        super().write_batch(text)
+        # Un lote más grande que maxBytes sobre un archivo vacío se escribe entero y rota después
+        if self.maxBytes > 0 and self.stream.tell() >= self.maxBytes:
+            self.doRollover()
+
+
+class BatchingLogListener:
+    """Background thread that takes records off the queue, up to `batch_size` at a
+    time, and hands each batch to every handler. It also sets the queue depth gauge
+    once per batch (set_function gauges read 0 in multiprocess mode)."""
+
+    _sentinel = None
+
+    def __init__(self, log_queue: queue.Queue, handlers: List[BatchHandlerMixin], batch_size: int = 256):
+        self.queue = log_queue
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Write everything still queued and stop the thread"""
+        if self._thread is None:
+            return
+        # Se espera sin límite: el sentinel tiene que entrar aunque la cola esté llena
+        self.queue.put(self._sentinel)
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = []
+            record = self.queue.get()
+            while True:
+                if record is self._sentinel:
+                    stopping = True
+                    break
+                batch.append(record)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    record = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            LOG_QUEUE_DEPTH.set(self.queue.qsize())
+            for handler in self.handlers:
+                handler.emit_batch(batch)
@@ -1,59 +1,72 @@
+import atexit
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
-import json
-from datetime import datetime
 import os
-from typing import Optional
+from typing import Any
+import orjson
 
 from app.infrastructure.settings.api_settings import settings
 from app.util.enums.environment import api_environments
+from app.util.functions.cached_timestamp import CachedTimestamp
+from app.infrastructure.settings.log_queue import BoundedQueueHandler, BatchStreamHandler, BatchRotatingFileHandler, BatchingLogListener
 
 LOG_DIR = "logs"
 if not os.path.exists(LOG_DIR):
     os.makedirs(LOG_DIR)
 
 class ApiLoggerAdapter(logging.LoggerAdapter):
+    """Attaches `extra` to the record as one `extra_info` field; the formatters encode it"""
     def process(self, msg, kwargs):
-        extra = kwargs.pop('extra', {})
+        extra = kwargs.pop('extra', None)
         if extra:
-            msg = f"{msg} | {json.dumps(extra, ensure_ascii=False)}"
-        return super().process(msg, kwargs)
+            kwargs['extra'] = {'extra_info': extra}
+        return msg, kwargs
+
+def encode_log_json(data: Any) -> str:
+    # Lo que orjson no sabe serializar se escribe como texto
+    return orjson.dumps(data, default=str).decode("utf-8")
 
 class JSONFormatter(logging.Formatter):
     
+    def __init__(self):
+        super().__init__()
+        self.timestamp = CachedTimestamp("%Y-%m-%dT%H:%M:%S", utc=True, milliseconds=True, suffix="Z")
+    
     def format(self, record: logging.LogRecord) -> str:
-        msg : str = record.getMessage()
-        extra_data: Optional[str] = None
-
-        if "|" in msg:
-            msg, extra_data = msg.split("|")
-        
         log_data = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": self.timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
-            "message": msg,
+            "message": record.getMessage(),
             "module": record.module,
             "function": record.funcName,
             "line": record.lineno,
         }
 
-        if extra_data:
-            log_data["extra_info"] = json.loads(extra_data)
+        extra_info = getattr(record, "extra_info", None)
+        if extra_info:
+            log_data["extra_info"] = extra_info
         
-        if record.exc_info:
-            log_data["exception"] = self.formatException(record.exc_info)
+        if record.exc_info or record.exc_text:
+            log_data["exception"] = record.exc_text or self.formatException(record.exc_info)
             
-        return json.dumps(log_data, ensure_ascii=False)
+        return encode_log_json(log_data)
 
 class SimpleFormatter(logging.Formatter):
+    
+    def __init__(self):
+        super().__init__()
+        self.timestamp = CachedTimestamp("%Y-%m-%d %H:%M:%S")
+        self.show_extra = not (settings.ENVIRONMENT == api_environments.PRODUCTION and not settings.DEBUG)
+    
     def format(self, record: logging.LogRecord) -> str:
         msg = record.getMessage()
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        if settings.ENVIRONMENT == api_environments.PRODUCTION and not settings.DEBUG:
-            msg = msg.split("|")[0]
-        new_format = f"[{timestamp}] [{record.levelname}]: {msg}"
+        extra_info = getattr(record, "extra_info", None)
+        if extra_info and self.show_extra:
+            msg = f"{msg} | {encode_log_json(extra_info)}"
+        # Los records se formatean en el hilo de escritura, la hora es la del record
+        new_format = f"[{self.timestamp(record.created)}] [{record.levelname}]: {msg}"
         return new_format
 
 
@@ -66,7 +79,7 @@ def setup_logging():
     json_formatter = JSONFormatter()
     simple_formatter = SimpleFormatter()
     
-    file_handler = RotatingFileHandler(
+    file_handler = BatchRotatingFileHandler(
         filename=os.path.join(LOG_DIR, "api.log"),
         maxBytes=10 * 1024 * 1024,  # 10MB
         backupCount=5,
@@ -75,11 +88,11 @@ def setup_logging():
     file_handler.setFormatter(json_formatter)
     file_handler.setLevel(logging.INFO)
     
-    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler = BatchStreamHandler(sys.stdout)
     console_handler.setFormatter(simple_formatter)
     console_handler.setLevel(logging.DEBUG if settings.DEBUG else logging.INFO)
     
-    error_handler = RotatingFileHandler(
+    error_handler = BatchRotatingFileHandler(
         filename=os.path.join(LOG_DIR, "error.log"),
         maxBytes=10 * 1024 * 1024,
         backupCount=5,
@@ -91,10 +104,13 @@ def setup_logging():
     for handler in logger.handlers[:]:
         logger.removeHandler(handler)
 
-    # Agregar handlers al logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-    logger.addHandler(error_handler)
+    # Las peticiones solo encolan; un hilo en segundo plano escribe por lotes
+    log_queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    listener = BatchingLogListener(log_queue, [file_handler, console_handler, error_handler], batch_size=settings.LOG_BATCH_SIZE)
+    listener.start()
+    atexit.register(listener.stop)
+    
+    logger.addHandler(BoundedQueueHandler(log_queue, full_policy=settings.LOG_QUEUE_FULL_POLICY, block_timeout=settings.LOG_QUEUE_BLOCK_TIMEOUT))
 
     adapter = ApiLoggerAdapter(logger, {})
     
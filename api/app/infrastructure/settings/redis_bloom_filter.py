@@ -0,0 +1,41 @@
+from typing import Iterable
+from app.infrastructure.settings.redis_client import AsyncRedisClient, async_redis_instance
+from app.util.functions.bloom_filter import bloom_filter_parameters, bloom_bit_positions
+
+
+class RedisBloomFilter:
+    """Bloom filter stored in a Redis bitmap so every API worker shares it.
+    might_contain() False means the value was never added. Until the filter has
+    been fully built it answers True for everything."""
+    
+    def __init__(self, key: str, capacity: int, error_rate: float, client: AsyncRedisClient = async_redis_instance):
+        self.key = key
+        self.ready_key = f"{key}:ready"
+        self.client = client
+        self.size, self.hashes = bloom_filter_parameters(capacity, error_rate)
+    
+    async def add(self, values: Iterable[str]):
+        """Set the bits of every value with one pipelined round trip"""
+        async with self.client.pipeline(transaction=False) as pipeline:
+            for value in values:
+                for position in bloom_bit_positions(value, self.size, self.hashes):
+                    pipeline.setbit(self.key, position, 1)
+    
+    async def might_contain(self, value: str) -> bool:
+        """Read the bits of a value with one pipelined round trip"""
+        async with self.client.pipeline(transaction=False) as pipeline:
+            pipeline.exists(self.ready_key)
+            for position in bloom_bit_positions(value, self.size, self.hashes):
+                pipeline.getbit(self.key, position)
+            is_ready, *bits = await pipeline.execute()
+        return not is_ready or all(bits)
+    
+    async def is_ready(self) -> bool:
+        return await self.client.key_exists(self.ready_key)
+    
+    async def mark_ready(self):
+        await self.client.redis_client.set(self.ready_key, 1)
+    
+    async def acquire_rebuild_lock(self, expire: int) -> bool:
+        """Only one worker rebuilds the filter at a time"""
+        return bool(await self.client.redis_client.set(f"{self.key}:rebuild", 1, nx=True, ex=expire))
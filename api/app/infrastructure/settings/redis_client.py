@@ -1,38 +1,244 @@
 # backend/app/core/redis.py
+import asyncio
+import math
+import random
+import time
+from contextlib import asynccontextmanager
+from uuid import uuid4
 from redis import Redis
-import json
+from redis.asyncio import Redis as AsyncRedis, BlockingConnectionPool as AsyncBlockingConnectionPool
+from redis.asyncio.client import Pipeline
+from redis.exceptions import RedisError
 from app.infrastructure.settings.api_settings import settings
-from typing import Optional, Any
+from app.infrastructure.settings.redis_codecs import RedisValueSerializer, redis_serializer
+from app.infrastructure.settings.logger import logger
+from app.handlers.monitoring.cache_monitoring import CACHE_COMPUTATIONS, CACHE_LOCK_WAITS
+from typing import Optional, Any, AsyncIterator, Awaitable, Callable, Dict, List
+
+# Borra el lock solo si sigue siendo nuestro
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
 
 class RedisClient:
-    def __init__(self):
+    def __init__(self, serializer: RedisValueSerializer = redis_serializer):
+        self.serializer = serializer
         self.redis_client = Redis(
             host=settings.REDIS_HOST,
             port=settings.REDIS_PORT,
             db=settings.REDIS_DB,
             password=settings.REDIS_PASSWORD,
-            decode_responses=True
+            socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            decode_responses=False
         )
     
-    def set_key(self, key: str, value: Any, expire: int = 3600):
+    def set_key(self, key: str, value: Any, expire: int = 3600, codec: Optional[str] = None):
         """Almacena valor en Redis con expiración"""
-        serialized_value = json.dumps(value)
+        serialized_value = self.serializer.encode(value, codec)
         self.redis_client.setex(key, expire, serialized_value)
     
     def get_key(self, key: str) -> Optional[Any]:
         """Obtiene valor de Redis"""
         value = self.redis_client.get(key)
         if value:
-            return json.loads(value)
+            return self.serializer.decode(value)
         return None
     
-    def delete_key(self, key: str):
-        """Elimina clave de Redis"""
-        self.redis_client.delete(key)
+    def delete_key(self, *keys: str):
+        """Elimina una o varias claves de Redis en un solo comando"""
+        self.redis_client.delete(*keys)
     
     def key_exists(self, key: str) -> bool:
         """Verifica si una clave existe"""
         return self.redis_client.exists(key) == 1
 
-# Instancia global
+
+class AsyncRedisClient:
+    """Cliente Redis asíncrono sobre un pool de conexiones explícito.
+    Con todas las conexiones en uso los comandos esperan hasta REDIS_POOL_TIMEOUT
+    en lugar de fallar con "Too many connections"."""
+    
+    def __init__(
+        self,
+        serializer: RedisValueSerializer = redis_serializer,
+        max_connections: int = settings.REDIS_MAX_CONNECTIONS,
+        pool_timeout: float = settings.REDIS_POOL_TIMEOUT,
+        socket_timeout: float = settings.REDIS_SOCKET_TIMEOUT,
+    ):
+        self.serializer = serializer
+        self.connection_pool = AsyncBlockingConnectionPool(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            password=settings.REDIS_PASSWORD,
+            max_connections=max_connections,
+            timeout=pool_timeout,
+            socket_connect_timeout=min(settings.REDIS_SOCKET_CONNECT_TIMEOUT, socket_timeout),
+            socket_timeout=socket_timeout,
+            decode_responses=False
+        )
+        self.redis_client = AsyncRedis(connection_pool=self.connection_pool)
+        self._release_lock = self.redis_client.register_script(RELEASE_LOCK_SCRIPT)
+        # Cálculos en curso por clave, para que cada worker calcule una clave una sola vez
+        self._computations: Dict[str, asyncio.Task] = {}
+    
+    async def set_key(self, key: str, value: Any, expire: int = 3600, codec: Optional[str] = None):
+        """Almacena valor en Redis con expiración"""
+        await self.redis_client.setex(key, expire, self.serializer.encode(value, codec))
+    
+    async def get_key(self, key: str) -> Optional[Any]:
+        """Obtiene valor de Redis"""
+        value = await self.redis_client.get(key)
+        if value:
+            return self.serializer.decode(value)
+        return None
+    
+    async def delete_key(self, *keys: str):
+        """Elimina una o varias claves de Redis en un solo comando"""
+        await self.redis_client.delete(*keys)
+    
+    async def key_exists(self, key: str) -> bool:
+        """Verifica si una clave existe"""
+        return await self.redis_client.exists(key) == 1
+    
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Obtiene varias claves con un solo MGET, las ausentes no se incluyen"""
+        if not keys:
+            return {}
+        values = await self.redis_client.mget(keys)
+        return {key: self.serializer.decode(value) for key, value in zip(keys, values) if value}
+    
+    async def set_many(self, values: Dict[str, Any], expire: int = 3600, codec: Optional[str] = None):
+        """Almacena varias claves con expiración en un solo round trip"""
+        if not values:
+            return
+        async with self.pipeline(transaction=False) as pipeline:
+            for key, value in values.items():
+                pipeline.setex(key, expire, self.serializer.encode(value, codec))
+    
+    async def delete_many(self, keys: List[str]) -> int:
+        """Elimina varias claves, devuelve cuántas existían"""
+        if not keys:
+            return 0
+        return await self.redis_client.delete(*keys)
+    
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = True) -> AsyncIterator[Pipeline]:
+        """Agrupa comandos en un round trip (MULTI/EXEC si transaction es True).
+        Los comandos pendientes se ejecutan al salir del bloque; para leer las
+        respuestas llama a `await pipeline.execute()` dentro del bloque."""
+        async with self.redis_client.pipeline(transaction=transaction) as pipeline:
+            yield pipeline
+            if len(pipeline):
+                await pipeline.execute()
+    
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: int = 0,
+        beta: float = settings.CACHE_EARLY_EXPIRATION_BETA,
+        codec: Optional[str] = None,
+    ) -> Any:
+        """Cached value of key, calling compute() on a miss. Only one caller per worker
+        computes a key at a time (the others await it) and a Redis lock makes the other
+        workers wait for that value instead of computing it too.
+        Hot keys are refreshed in the background before they expire (probabilistic early
+        expiration, `beta` > 1 refreshes earlier). With `stale_ttl` the value is kept that
+        many seconds past its ttl and served while it is recomputed in the background.
+        The value is stored inside an envelope so it must be encodable by the codec."""
+        try:
+            entry = await self.get_key(key)
+        except RedisError as e:
+            logger.warning("Cache read failed, computing the value", extra={"key": key, "error": str(e)})
+            return await compute()
+        
+        if entry is not None:
+            now = time.time()
+            # XFetch: cuanto más caro es calcular el valor, antes se refresca
+            if now - entry["delta"] * beta * math.log(1.0 - random.random()) < entry["expires_at"]:
+                return entry["value"]
+            reason = "early" if now < entry["expires_at"] else "stale"
+            if reason == "early" or stale_ttl:
+                self._start_computation(key, compute, ttl, stale_ttl, codec, reason)
+                return entry["value"]
+        
+        return await asyncio.shield(self._start_computation(key, compute, ttl, stale_ttl, codec, "miss"))
+    
+    def _start_computation(self, key: str, compute: Callable[[], Awaitable[Any]], ttl: int, stale_ttl: int, codec: Optional[str], reason: str) -> asyncio.Task:
+        task = self._computations.get(key)
+        if task is None:
+            task = asyncio.create_task(self._compute_with_lock(key, compute, ttl, stale_ttl, codec, reason))
+            self._computations[key] = task
+            task.add_done_callback(lambda done: self._computation_done(key, done))
+        return task
+    
+    def _computation_done(self, key: str, task: asyncio.Task):
+        self._computations.pop(key, None)
+        # Los refrescos en segundo plano no tienen a nadie esperando el resultado
+        if not task.cancelled() and task.exception():
+            logger.warning("Cache compute failed", extra={"key": key, "error": str(task.exception())})
+    
+    async def _compute_with_lock(self, key: str, compute: Callable[[], Awaitable[Any]], ttl: int, stale_ttl: int, codec: Optional[str], reason: str) -> Any:
+        lock_key = f"{key}:lock"
+        token = uuid4().hex
+        locked = False
+        try:
+            locked = bool(await self.redis_client.set(lock_key, token, nx=True, px=int(settings.CACHE_LOCK_TIMEOUT * 1000)))
+            if not locked:
+                # Otro worker está calculando la clave
+                entry = await self._wait_for_entry(key)
+                if entry is not None:
+                    return entry["value"]
+        except RedisError as e:
+            logger.warning("Cache lock failed, computing without it", extra={"key": key, "error": str(e)})
+        
+        try:
+            started = time.monotonic()
+            value = await compute()
+            CACHE_COMPUTATIONS.labels(reason=reason).inc()
+            entry = {"value": value, "delta": time.monotonic() - started, "expires_at": time.time() + ttl}
+            try:
+                await self.set_key(key, entry, expire=ttl + stale_ttl, codec=codec)
+            except RedisError as e:
+                logger.warning("Cache write failed", extra={"key": key, "error": str(e)})
+            return value
+        finally:
+            if locked:
+                try:
+                    await self._release_lock(keys=[lock_key], args=[token])
+                except RedisError as e:
+                    # Expira solo al pasar CACHE_LOCK_TIMEOUT
+                    logger.warning("Cache lock release failed", extra={"key": key, "error": str(e)})
+    
+    async def _wait_for_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """Poll key while another worker holds its lock. A refresh finds the
+        current entry right away; None once the lock would have expired."""
+        deadline = time.monotonic() + settings.CACHE_LOCK_TIMEOUT
+        while time.monotonic() < deadline:
+            entry = await self.get_key(key)
+            if entry is not None:
+                CACHE_LOCK_WAITS.labels(outcome="value").inc()
+                return entry
+            await asyncio.sleep(settings.CACHE_LOCK_POLL_INTERVAL)
+        CACHE_LOCK_WAITS.labels(outcome="timeout").inc()
+        return None
+    
+    async def close(self):
+        await self.connection_pool.disconnect()
+
+# Instancias globales
 redis_instance = RedisClient()
+async_redis_instance = AsyncRedisClient()
+# Pool propio para el rate limiter: la carga de la caché no le quita conexiones y
+# sus esperas son cortas porque corre en cada petición
+rate_limit_redis_instance = AsyncRedisClient(
+    max_connections=settings.RATE_LIMIT_REDIS_MAX_CONNECTIONS,
+    pool_timeout=settings.RATE_LIMIT_REDIS_TIMEOUT,
+    socket_timeout=settings.RATE_LIMIT_REDIS_TIMEOUT
+)
@@ -0,0 +1,152 @@
+import json
+import struct
+import zlib
+from typing import Any, Dict, Optional
+
+import msgpack
+import numpy as np
+import orjson
+
+from app.infrastructure.settings.api_settings import settings
+from app.handlers.monitoring.redis_monitoring import REDIS_BYTES_WRITTEN, REDIS_BYTES_READ, REDIS_UNCOMPRESSED_BYTES_WRITTEN
+
+# Cabecera de un byte delante de cada valor: 1vvz cccc
+#   bit 7    siempre 1, los valores JSON antiguos (sin cabecera) empiezan por ASCII
+#   bits 6-5 versión del formato
+#   bit 4    payload comprimido con zlib
+#   bits 3-0 id del codec
+HEADER_MARKER = 0x80
+FORMAT_VERSION = 1
+COMPRESSED_FLAG = 0x10
+CODEC_ID_MASK = 0x0F
+
+
+class RedisCodec:
+    """Converts a value to bytes and back. `id` is stored in the header so it must never change."""
+    name: str
+    id: int
+
+    def encode(self, value: Any) -> bytes:
+        raise NotImplementedError
+
+    def decode(self, payload: bytes) -> Any:
+        raise NotImplementedError
+
+
+class JsonCodec(RedisCodec):
+    name = "json"
+    id = 0
+
+    def encode(self, value: Any) -> bytes:
+        return json.dumps(value).encode("utf-8")
+
+    def decode(self, payload: bytes) -> Any:
+        return json.loads(payload)
+
+
+class OrjsonCodec(RedisCodec):
+    name = "orjson"
+    id = 1
+
+    def encode(self, value: Any) -> bytes:
+        return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    def decode(self, payload: bytes) -> Any:
+        return orjson.loads(payload)
+
+
+class MsgpackCodec(RedisCodec):
+    name = "msgpack"
+    id = 2
+
+    def encode(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    def decode(self, payload: bytes) -> Any:
+        return msgpack.unpackb(payload, raw=False)
+
+
+class NumpyCodec(RedisCodec):
+    """Raw ndarray buffer prefixed by its dtype and shape. Decoded arrays are read-only views."""
+    name = "numpy"
+    id = 3
+
+    def encode(self, value: Any) -> bytes:
+        array = np.ascontiguousarray(value)
+        if array.dtype.hasobject:
+            raise ValueError("Object arrays can not be stored as a raw buffer")
+        dtype = array.dtype.str.encode("ascii")
+        shape = struct.pack(f"<B{len(dtype)}sB{array.ndim}Q", len(dtype), dtype, array.ndim, *array.shape)
+        return shape + array.tobytes()
+
+    def decode(self, payload: bytes) -> Any:
+        dtype_length = payload[0]
+        dtype = payload[1:1 + dtype_length].decode("ascii")
+        offset = 1 + dtype_length
+        ndim = payload[offset]
+        offset += 1
+        shape = struct.unpack_from(f"<{ndim}Q", payload, offset)
+        offset += 8 * ndim
+        return np.frombuffer(payload, dtype=np.dtype(dtype), offset=offset).reshape(shape)
+
+
+CODECS: Dict[str, RedisCodec] = {codec.name: codec for codec in (JsonCodec(), OrjsonCodec(), MsgpackCodec(), NumpyCodec())}
+CODECS_BY_ID: Dict[int, RedisCodec] = {codec.id: codec for codec in CODECS.values()}
+
+
+class RedisValueSerializer:
+    """Encodes values with a codec behind a versioned header byte and compresses
+    them with zlib once they pass the size threshold. Decoding reads the codec
+    from the header, so one key can be rewritten with another codec at any time."""
+
+    def __init__(self, default_codec: str = settings.REDIS_DEFAULT_CODEC, compression_threshold: int = settings.REDIS_COMPRESSION_THRESHOLD, compression_level: int = settings.REDIS_COMPRESSION_LEVEL):
+        self.default_codec = self._codec(default_codec)
+        self.compression_threshold = compression_threshold
+        self.compression_level = compression_level
+
+    def encode(self, value: Any, codec: Optional[str] = None) -> bytes:
+        value_codec = self._codec(codec) if codec else self.default_codec
+        payload = value_codec.encode(value)
+        REDIS_UNCOMPRESSED_BYTES_WRITTEN.labels(codec=value_codec.name).inc(len(payload))
+
+        header = HEADER_MARKER | FORMAT_VERSION << 5 | value_codec.id
+        if len(payload) >= self.compression_threshold:
+            compressed_payload = zlib.compress(payload, self.compression_level)
+            # Solo se guarda comprimido si de verdad ocupa menos
+            if len(compressed_payload) < len(payload):
+                payload = compressed_payload
+                header |= COMPRESSED_FLAG
+
+        value_bytes = bytes((header,)) + payload
+        REDIS_BYTES_WRITTEN.labels(codec=value_codec.name).inc(len(value_bytes))
+        return value_bytes
+
+    def decode(self, value_bytes: bytes) -> Any:
+        header = value_bytes[0]
+        if not header & HEADER_MARKER:
+            # Valor escrito antes de los codecs: JSON plano
+            REDIS_BYTES_READ.labels(codec=JsonCodec.name).inc(len(value_bytes))
+            return json.loads(value_bytes)
+
+        version = header >> 5 & 0x03
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported Redis value format version {version}")
+        value_codec = CODECS_BY_ID.get(header & CODEC_ID_MASK)
+        if value_codec is None:
+            raise ValueError(f"Unknown Redis value codec id {header & CODEC_ID_MASK}")
+
+        REDIS_BYTES_READ.labels(codec=value_codec.name).inc(len(value_bytes))
+        payload = value_bytes[1:]
+        if header & COMPRESSED_FLAG:
+            payload = zlib.decompress(payload)
+        return value_codec.decode(payload)
+
+    @staticmethod
+    def _codec(name: str) -> RedisCodec:
+        if name not in CODECS:
+            raise ValueError(f"Unknown Redis codec '{name}', expected one of {', '.join(CODECS)}")
+        return CODECS[name]
+
+
+# Instancia global
+redis_serializer = RedisValueSerializer()
@@ -0,0 +1,227 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from app.infrastructure.settings.api_settings import settings
+from app.infrastructure.settings.redis_client import AsyncRedisClient, async_redis_instance
+from app.infrastructure.settings.logger import logger
+from app.handlers.monitoring.cache_monitoring import (
+    CACHE_TIER_HITS, CACHE_TIER_MISSES, LOCAL_CACHE_ENTRIES, LOCAL_CACHE_BYTES,
+    LOCAL_CACHE_EVICTIONS, CACHE_INVALIDATIONS_RECEIVED
+)
+from app.handlers.monitoring.metrics_exposition import set_gauge_function
+from app.util.functions.local_cache import LocalTTLCache
+
+RESUBSCRIBE_DELAY = 1
+# Espera máxima por mensaje; con un timeout explícito redis-py no aplica REDIS_SOCKET_TIMEOUT
+# y un canal sin mensajes no se toma como conexión perdida
+LISTEN_TIMEOUT = 1
+
+# Escribe los valores leídos tras un miss solo si no hubo invalidaciones desde que se
+# leyó la versión (KEYS[1]); ARGV = versión, expire, valores en el orden de KEYS[2..]
+FILL_SCRIPT = """
+if (redis.call("GET", KEYS[1]) or "0") ~= ARGV[1] then
+    return 0
+end
+for i = 2, #KEYS do
+    redis.call("SETEX", KEYS[i], ARGV[2], ARGV[i + 1])
+end
+return 1
+"""
+
+# (versión de invalidaciones en Redis, generación local) leídas antes de ir a la base de datos
+FillVersion = Tuple[bytes, int]
+
+
+class TwoTierCache:
+    """In-process TTL/LRU cache (L1) in front of Redis (L2), with the same get/set/delete
+    methods as AsyncRedisClient. Writes and deletes publish the changed keys on a pub/sub
+    channel and the other workers drop them from their L1. A worker that loses the
+    subscription clears its whole L1, since it may have missed invalidations.
+    Read-miss fills publish nothing and use get_with_version/fill_many: every
+    invalidation bumps a version in Redis and a fill is dropped if the version moved
+    since the value was read, so a slow read can never write back an old row."""
+
+    def __init__(
+        self,
+        name: str,
+        client: AsyncRedisClient = async_redis_instance,
+        max_entries: int = settings.LOCAL_CACHE_MAX_ENTRIES,
+        max_bytes: int = settings.LOCAL_CACHE_MAX_BYTES,
+        local_ttl: int = settings.LOCAL_CACHE_TTL,
+        channel: str = settings.CACHE_INVALIDATION_CHANNEL,
+    ):
+        self.name = name
+        self.client = client
+        self.channel = channel
+        self.origin = uuid4().hex
+        self.version_key = f"cache:{name}:version"
+        self.local = LocalTTLCache(max_entries, max_bytes, local_ttl, on_evict=lambda key: LOCAL_CACHE_EVICTIONS.labels(cache=name).inc())
+        # Se incrementa con cada cambio local para no rellenar L1 con lecturas que se cruzaron con una invalidación
+        self._generation = 0
+        self._listener_task: Optional[asyncio.Task] = None
+        self._fill_script = None
+        set_gauge_function(LOCAL_CACHE_ENTRIES.labels(cache=name), lambda: len(self.local))
+        set_gauge_function(LOCAL_CACHE_BYTES.labels(cache=name), lambda: self.local.total_bytes)
+
+    async def get_key(self, key: str) -> Optional[Any]:
+        """Obtiene valor de L1 o, si no está, de Redis"""
+        return (await self.get_many([key])).get(key)
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Obtiene varias claves; las que no están en L1 se piden a Redis con un solo MGET"""
+        values = {}
+        missing_keys = []
+        for key in keys:
+            found, value = self.local.get(key)
+            if found:
+                values[key] = value
+            else:
+                missing_keys.append(key)
+        self._count("local", hits=len(values), misses=len(missing_keys))
+        if not missing_keys:
+            return values
+
+        generation = self._generation
+        encoded_values = await self.client.redis_client.mget(missing_keys)
+        fill_local = generation == self._generation
+        redis_hits = 0
+        for key, encoded_value in zip(missing_keys, encoded_values):
+            if encoded_value is None:
+                continue
+            redis_hits += 1
+            values[key] = self.client.serializer.decode(encoded_value)
+            if fill_local:
+                self.local.set(key, values[key], len(encoded_value))
+        self._count("redis", hits=redis_hits, misses=len(missing_keys) - redis_hits)
+        return values
+
+    async def get_with_version(self, key: str) -> Tuple[Optional[Any], FillVersion]:
+        """Like get_key, also returning the version to pass to fill_many on a miss.
+        The version is read in the same MGET as the value"""
+        generation = self._generation
+        found, value = self.local.get(key)
+        self._count("local", hits=int(found), misses=int(not found))
+        if found:
+            return value, (b"", generation)
+
+        encoded_value, version = await self.client.redis_client.mget([key, self.version_key])
+        fill_local = generation == self._generation
+        self._count("redis", hits=int(encoded_value is not None), misses=int(encoded_value is None))
+        if encoded_value is None:
+            return None, (version or b"0", generation)
+        value = self.client.serializer.decode(encoded_value)
+        if fill_local:
+            self.local.set(key, value, len(encoded_value))
+        return value, (version or b"0", generation)
+
+    async def fill_many(self, values: Dict[str, Any], version: FillVersion, expire: int = 3600, codec: Optional[str] = None) -> bool:
+        """Almacena valores leídos tras un miss sin publicar invalidaciones (el dato no cambió).
+        No escribe nada si hubo una invalidación desde get_with_version; devuelve si escribió"""
+        if not values:
+            return False
+        redis_version, generation = version
+        encoded_values = {key: self.client.serializer.encode(value, codec) for key, value in values.items()}
+        if self._fill_script is None:
+            self._fill_script = self.client.redis_client.register_script(FILL_SCRIPT)
+        filled = await self._fill_script(
+            keys=[self.version_key, *encoded_values],
+            args=[redis_version, expire, *encoded_values.values()]
+        )
+        if not filled:
+            return False
+        if generation == self._generation:
+            for key, value in values.items():
+                self.local.set(key, value, len(encoded_values[key]), ttl=expire)
+        return True
+
+    async def set_key(self, key: str, value: Any, expire: int = 3600, codec: Optional[str] = None):
+        """Almacena valor en Redis y en L1, e invalida la clave en los demás workers"""
+        await self.set_many({key: value}, expire=expire, codec=codec)
+
+    async def set_many(self, values: Dict[str, Any], expire: int = 3600, codec: Optional[str] = None):
+        """Almacena varias claves en un solo round trip junto con la invalidación"""
+        if not values:
+            return
+        encoded_values = {key: self.client.serializer.encode(value, codec) for key, value in values.items()}
+        async with self.client.pipeline(transaction=False) as pipeline:
+            for key, encoded_value in encoded_values.items():
+                pipeline.setex(key, expire, encoded_value)
+            pipeline.incr(self.version_key)
+            pipeline.publish(self.channel, self._invalidation_message(list(values)))
+        self._generation += 1
+        for key, value in values.items():
+            self.local.set(key, value, len(encoded_values[key]), ttl=expire)
+
+    async def delete_many(self, keys: List[str]) -> int:
+        """Elimina varias claves de Redis y de L1 en todos los workers, devuelve cuántas existían en Redis"""
+        if not keys:
+            return 0
+        self._generation += 1
+        self.local.delete(*keys)
+        async with self.client.pipeline(transaction=False) as pipeline:
+            pipeline.delete(*keys)
+            pipeline.incr(self.version_key)
+            pipeline.publish(self.channel, self._invalidation_message(keys))
+            deleted, _, _ = await pipeline.execute()
+        return deleted
+
+    async def delete_key(self, *keys: str):
+        """Elimina una o varias claves"""
+        await self.delete_many(list(keys))
+
+    async def start(self):
+        """Start listening for invalidations from the other workers"""
+        if self._listener_task is None:
+            self._listener_task = asyncio.create_task(self._listen())
+
+    async def close(self):
+        if self._listener_task is None:
+            return
+        self._listener_task.cancel()
+        try:
+            await self._listener_task
+        except asyncio.CancelledError:
+            pass
+        self._listener_task = None
+
+    async def _listen(self):
+        while True:
+            try:
+                async with self.client.redis_client.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    # Mientras no había suscripción se pudieron perder invalidaciones
+                    self._clear_local()
+                    while True:
+                        message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=LISTEN_TIMEOUT)
+                        if message and message["type"] == "message":
+                            self._apply_invalidation(message["data"])
+            except Exception as e:
+                logger.warning("Cache invalidation subscription lost", extra={"cache": self.name, "error": str(e)})
+                self._clear_local()
+                await asyncio.sleep(RESUBSCRIBE_DELAY)
+
+    def _apply_invalidation(self, data: bytes):
+        message = self.client.serializer.decode(data)
+        if message["origin"] == self.origin:
+            return
+        self._generation += 1
+        self.local.delete(*message["keys"])
+        CACHE_INVALIDATIONS_RECEIVED.labels(cache=self.name).inc()
+
+    def _invalidation_message(self, keys: List[str]) -> bytes:
+        return self.client.serializer.encode({"origin": self.origin, "keys": keys})
+
+    def _clear_local(self):
+        self._generation += 1
+        self.local.clear()
+
+    def _count(self, tier: str, hits: int, misses: int):
+        if hits:
+            CACHE_TIER_HITS.labels(cache=self.name, tier=tier).inc(hits)
+        if misses:
+            CACHE_TIER_MISSES.labels(cache=self.name, tier=tier).inc(misses)
+
+
+# Instancia global
+two_tier_cache = TwoTierCache("default")
@@ -1,14 +1,25 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from app.handlers.error.api_validation_error import api_validation_error
 from app.infrastructure.settings.logger import logger
-from app.handlers.monitoring.api_monitoring import api_monitoring
-from app.infrastructure.database.adapters.postgres_db import get_conection_database
+from app.handlers.monitoring.api_monitoring import APIMonitoring
+from app.handlers.monitoring.metrics_exposition import mark_metrics_process_dead
+from app.handlers.rate_limit.api_rate_limiter import APIRateLimiter
+from app.infrastructure.settings.api_settings import settings
+from app.infrastructure.database.adapters.postgres_db import AsyncSessionLocal, warm_up_database_pool
+from app.infrastructure.database.repositories.async_user_repository import AsyncUserRepository
+from app.core.services.password_hasher import password_hasher
+from app.core.services.system_metrics import system_metrics_sampler
+from app.core.services.user_availability import rebuild_availability_filters
+from app.infrastructure.settings.redis_client import async_redis_instance, rate_limit_redis_instance
+from app.infrastructure.settings.two_tier_cache import two_tier_cache
 from app.handlers.error.response_error_exception import ResponseErrorException
 from app.handlers.error.api_error_handler import api_error
 from app.controllers import health
 from app.controllers import user
+from app.util.mappers.api_response import ApiJSONResponse
 
 app = FastAPI(
     title="Investment Portfolio API",
@@ -16,27 +27,67 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ApiJSONResponse,
 )
 
+app.state.is_ready = False
+
+async def build_availability_filters():
+    # Until the filters are ready availability checks fall back to the database
+    try:
+        async with AsyncSessionLocal() as db:
+            if await rebuild_availability_filters(AsyncUserRepository(db)):
+                logger.info("✅ Availability filters built", extra=None)
+    except Exception as e:
+        logger.error("❌ Availability filters build error", extra={"error": str(e)})
+
+async def warm_up_services():
+    # Reintenta con backoff hasta que la base de datos esté disponible
+    delay = settings.WARMUP_RETRY_INITIAL_DELAY
+    while True:
+        try:
+            connections = await warm_up_database_pool(settings.DB_POOL_WARMUP_CONNECTIONS)
+            logger.info("✅ Connection database success", extra={"warm_connections": connections})
+            await password_hasher.warm_up()
+            break
+        except Exception as e:
+            logger.error("❌ Connection database error", extra={"error": str(e), "retry_in": delay})
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, settings.WARMUP_RETRY_MAX_DELAY)
+    app.state.availability_filters_task = asyncio.create_task(build_availability_filters())
+    app.state.is_ready = True
+
+# Inicializar base de datos al iniciar
+@app.on_event("startup")
+async def on_startup():
+    await system_metrics_sampler.start()
+    # El listener de invalidaciones no depende de la base de datos
+    await two_tier_cache.start()
+    app.state.warm_up_task = asyncio.create_task(warm_up_services())
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    app.state.warm_up_task.cancel()
+    await system_metrics_sampler.stop()
+    password_hasher.shutdown()
+    await two_tier_cache.close()
+    await async_redis_instance.close()
+    await rate_limit_redis_instance.close()
+    mark_metrics_process_dead()
+
+# El rate limiter queda dentro del monitoring para que los 429 también se midan, y
+# CORS se registra al final (el más externo) para que también lleven sus cabeceras
+app.add_middleware(APIRateLimiter)
+app.add_middleware(APIMonitoring)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After", "X-RateLimit-Limit", "X-RateLimit-Remaining"],
 )
 
-# Inicializar base de datos al iniciar
-@app.on_event("startup")
-async def on_startup():
-    try:
-        get_conection_database()
-        logger.info("✅ Connection database success", extra=None)
-    except Exception as e:
-        logger.error("❌ Connection database error", extra={"error": str(e)})
-
-app.middleware("http")(api_monitoring)
-
 app.exception_handler(RequestValidationError)(api_validation_error)
 app.exception_handler(ResponseErrorException)(api_error)
 
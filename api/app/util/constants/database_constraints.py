@@ -0,0 +1,5 @@
+# Postgres names the unnamed unique constraints of the initial migration <table>_<column>_key
+USER_CONSTRAINT_ERRORS = {
+    "users_email_key": "Email already registered",
+    "users_username_key": "Username already taken",
+}
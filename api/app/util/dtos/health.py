@@ -5,6 +5,10 @@ class MonitoringSystem(BaseModel):
     memory_usage: float
     cpu_usage: float
     disk_usage: float
+    process_cpu_usage: Optional[float] = None
+    process_memory_rss: Optional[int] = None
+    process_threads: Optional[int] = None
+    sampled_at: Optional[str] = None
 
 class ServicesDTO(BaseModel):
     database: Optional[str] = None
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, EmailStr, field_validator, Field
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
+from uuid import UUID
 
 
 class UserDTO(BaseModel):
@@ -57,6 +58,27 @@ class UserDTO(BaseModel):
         return v
 
 
+class UserUpdateDTO(UserDTO):
+    """DTO for partial user updates, only the fields sent are changed"""
+    first_name: str = Field(None, min_length=1, max_length=50)
+    last_name: str = Field(None, min_length=1, max_length=50)
+    username: str = Field(None, min_length=3, max_length=50)
+    email: EmailStr = Field(None)
+    password: str = Field(None, min_length=6)
+    is_active: bool = Field(None)
+    is_admin: bool = Field(None)
+
+
+class UserBulkDeactivateDTO(BaseModel):
+    """DTO for deactivating many users at once"""
+    user_ids: List[UUID] = Field(..., min_length=1, max_length=1000)
+
+
+class UserLookupDTO(BaseModel):
+    """DTO for fetching many users by id at once"""
+    user_ids: List[UUID] = Field(..., min_length=1, max_length=1000)
+
+
 class UserResponseDTO(BaseModel):
     """DTO for user responses (without sensitive data like password)"""
     id: str
@@ -71,3 +93,36 @@ class UserResponseDTO(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+class UserImportRowErrorDTO(BaseModel):
+    """Errors found for one row of a bulk import"""
+    row: int
+    errors: List[str]
+
+
+class UserImportReportDTO(BaseModel):
+    """Summary returned by the bulk user import"""
+    total_rows: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: List[UserImportRowErrorDTO] = []
+
+
+class UserPageDTO(BaseModel):
+    """A page of users and the cursor to request the next one"""
+    items: List[UserResponseDTO] = []
+    next_cursor: Optional[str] = None
+
+
+class UserStatsDTO(BaseModel):
+    """User counts, computed at most once per USER_STATS_CACHE_TTL"""
+    total: int
+    active: int
+    admins: int
+
+
+class UserAvailabilityDTO(BaseModel):
+    """Whether a username and/or email can still be registered"""
+    username_available: Optional[bool] = None
+    email_available: Optional[bool] = None
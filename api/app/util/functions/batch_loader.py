@@ -0,0 +1,60 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, List, Optional, Set, TypeVar
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+class BatchLoader(Generic[K, V]):
+    """DataLoader style loader: every load() issued in the same event loop tick is
+    resolved by one load_many() call, and results are memoized for the loader's life.
+    Nothing is ever evicted: create one per request (never a shared or global one)
+    so memoized rows never outlive it."""
+    
+    def __init__(self, load_many: Callable[[List[K]], Awaitable[List[V]]], key_of: Callable[[V], K]):
+        self.load_many = load_many
+        self.key_of = key_of
+        self._results: Dict[K, asyncio.Future] = {}
+        self._pending_keys: List[K] = []
+        self._batch_lock = asyncio.Lock()
+        self._batch_tasks: Set[asyncio.Task] = set()
+    
+    async def load(self, key: K) -> Optional[V]:
+        """Value for key, or None when it does not exist"""
+        if key not in self._results:
+            loop = asyncio.get_running_loop()
+            self._results[key] = loop.create_future()
+            if not self._pending_keys:
+                loop.call_soon(self._dispatch)
+            self._pending_keys.append(key)
+        # Un awaiter cancelado (cliente desconectado) no debe cancelar el future de los demás
+        return await asyncio.shield(self._results[key])
+    
+    async def load_all(self, keys: List[K]) -> List[Optional[V]]:
+        """Values for all keys, in the same order, with a single batch"""
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+    
+    def _dispatch(self):
+        keys, self._pending_keys = self._pending_keys, []
+        task = asyncio.ensure_future(self._run_batch(keys))
+        # The event loop only keeps weak references to tasks
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+    
+    async def _run_batch(self, keys: List[K]):
+        # A session cannot run two queries at once, batches go one after another
+        async with self._batch_lock:
+            try:
+                values = await self.load_many(keys)
+            except Exception as e:
+                for key in keys:
+                    future = self._results.pop(key)
+                    if not future.done():
+                        future.set_exception(e)
+                return
+        
+        values_by_key = {self.key_of(value): value for value in values}
+        for key in keys:
+            future = self._results[key]
+            if not future.done():
+                future.set_result(values_by_key.get(key))
@@ -0,0 +1,18 @@
+import hashlib
+import math
+from typing import List, Tuple
+
+
+def bloom_filter_parameters(capacity: int, error_rate: float) -> Tuple[int, int]:
+    """Number of bits and hash functions for the expected capacity and false positive rate"""
+    size = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+    hashes = max(1, round(size / capacity * math.log(2)))
+    return size, hashes
+
+
+def bloom_bit_positions(value: str, size: int, hashes: int) -> List[int]:
+    """Bit offsets of a value using Kirsch-Mitzenmacher double hashing over one blake2b digest"""
+    digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+    first_hash = int.from_bytes(digest[:8], "little")
+    second_hash = int.from_bytes(digest[8:], "little") | 1
+    return [(first_hash + i * second_hash) % size for i in range(hashes)]
@@ -0,0 +1,31 @@
+from datetime import datetime, timezone
+
+
+class CachedTimestamp:
+    """Formats epoch timestamps (LogRecord.created) reusing work: the date and time
+    part is formatted once per second and the whole string once per millisecond.
+    With `milliseconds` the result ends in '.mmm'."""
+
+    def __init__(self, format: str, utc: bool = False, milliseconds: bool = False, suffix: str = ""):
+        self.format = format
+        self.timezone = timezone.utc if utc else None
+        self.milliseconds = milliseconds
+        self.suffix = suffix
+        self._second = (None, "")
+        self._millisecond = (None, "")
+
+    def __call__(self, created: float) -> str:
+        millisecond = int(created * 1000)
+        cached_millisecond, value = self._millisecond
+        if millisecond == cached_millisecond:
+            return value
+
+        second, fraction = divmod(millisecond, 1000)
+        cached_second, prefix = self._second
+        if second != cached_second:
+            prefix = datetime.fromtimestamp(second, self.timezone).strftime(self.format)
+            self._second = (second, prefix)
+
+        value = f"{prefix}.{fraction:03d}{self.suffix}" if self.milliseconds else f"{prefix}{self.suffix}"
+        self._millisecond = (millisecond, value)
+        return value
@@ -0,0 +1,11 @@
+from typing import Optional
+from sqlalchemy.exc import IntegrityError
+
+
+def get_constraint_name(error: IntegrityError) -> Optional[str]:
+    """Name of the constraint that raised the IntegrityError, for psycopg2 and asyncpg"""
+    diag = getattr(error.orig, "diag", None)
+    if diag is not None and getattr(diag, "constraint_name", None):
+        return diag.constraint_name
+    driver_error = getattr(error.orig, "__cause__", None)
+    return getattr(driver_error, "constraint_name", None)
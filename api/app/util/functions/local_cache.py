@@ -0,0 +1,66 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, NamedTuple, Optional, Tuple, TypeVar
+
+K = TypeVar('K', bound=Hashable)
+
+
+class _Entry(NamedTuple):
+    value: Any
+    size: int
+    expires_at: float
+
+
+class LocalTTLCache(Generic[K]):
+    """In-process cache bounded by entry count and total bytes. Entries expire after
+    their ttl and the least recently used ones are evicted first when a bound is hit.
+    Values are returned as stored, callers must not mutate them."""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float, on_evict: Optional[Callable[[K], None]] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self.total_bytes = 0
+        self._entries: "OrderedDict[K, _Entry]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> Tuple[bool, Any]:
+        """(found, value); a hit becomes the most recently used entry"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            return False, None
+        self._entries.move_to_end(key)
+        return True, entry.value
+
+    def set(self, key: K, value: Any, size: int, ttl: Optional[float] = None):
+        """Store value, `size` is its encoded length in bytes. Values bigger than
+        max_bytes are not cached at all."""
+        self._remove(key)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = _Entry(value, size, time.monotonic() + min(ttl or self.ttl, self.ttl))
+        self.total_bytes += size
+        while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+            evicted_key, evicted = self._entries.popitem(last=False)
+            self.total_bytes -= evicted.size
+            if self.on_evict:
+                self.on_evict(evicted_key)
+
+    def delete(self, *keys: K):
+        for key in keys:
+            self._remove(key)
+
+    def clear(self):
+        self._entries.clear()
+        self.total_bytes = 0
+
+    def _remove(self, key: K):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry.size
@@ -0,0 +1,37 @@
+from typing import List, Optional, Tuple
+
+RATE_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+def parse_rate(rate: str) -> Tuple[int, int]:
+    """'10/minute' -> (10 requests, 60 seconds)"""
+    try:
+        requests, period = rate.strip().split("/")
+        return int(requests), RATE_PERIODS[period.strip().lower()]
+    except (ValueError, KeyError):
+        raise ValueError(f"Invalid rate '{rate}', expected '<requests>/<{'|'.join(RATE_PERIODS)}>'")
+
+
+def parse_route_rule(rule: str) -> Tuple[Optional[str], str]:
+    """'POST /user/create-user' -> ('POST', '/user/create-user'), '/monitoring' -> (None, '/monitoring')"""
+    parts = rule.split()
+    if len(parts) == 2:
+        return parts[0].upper(), parts[1].rstrip("/")
+    return None, parts[0].rstrip("/")
+
+
+def forwarded_client(values: List[str], trusted_hops: int) -> Optional[str]:
+    """Client address from X-Forwarded-For style header values. Each trusted proxy
+    appends the address it received the request from, so the client is the value
+    trusted_hops from the right; anything further left was sent by the client.
+    None when the header has fewer values than trusted proxies."""
+    addresses = [address.strip() for value in values for address in value.split(",") if address.strip()]
+    if trusted_hops < 1 or len(addresses) < trusted_hops:
+        return None
+    return addresses[-trusted_hops]
+
+
+def route_rule_matches(method: Optional[str], prefix: str, request_method: str, path: str) -> bool:
+    if method is not None and method != request_method:
+        return False
+    return path == prefix or path.startswith(prefix + "/")
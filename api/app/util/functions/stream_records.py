@@ -0,0 +1,164 @@
+import csv
+import io
+import json
+import zlib
+from collections import deque
+from datetime import datetime
+from typing import AsyncIterator, Any, Deque, Dict, List, Sequence, Tuple, Union
+from pydantic_core import to_json
+
+# A parsed record or the error message explaining why the line could not be parsed
+StreamRecord = Tuple[int, Union[Dict[str, Any], str]]
+
+
+async def iter_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Splits a byte stream into lines without buffering the whole body.
+    Lines are not decoded here so a bad byte only fails its own row."""
+    pending = b""
+    async for chunk in stream:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line.rstrip(b"\r")
+    if pending:
+        yield pending.rstrip(b"\r")
+
+
+def _decode_error(error: UnicodeDecodeError) -> str:
+    return f"Invalid UTF-8 at byte {error.start} of the line"
+
+
+class _LineFeeder:
+    """Sync iterator over lines appended later, lets one csv.reader read an async stream.
+    The reader is only advanced once a whole record is queued."""
+
+    def __init__(self):
+        self.lines: Deque[str] = deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            raise StopIteration
+        return self.lines.popleft()
+
+
+async def iter_ndjson_records(stream: AsyncIterator[bytes]) -> AsyncIterator[StreamRecord]:
+    """Yields (row_number, record) for every non empty NDJSON line"""
+    row_number = 0
+    async for raw_line in iter_lines(stream):
+        if not raw_line.strip():
+            continue
+        row_number += 1
+        try:
+            record = json.loads(raw_line.decode("utf-8"))
+        except UnicodeDecodeError as e:
+            yield row_number, _decode_error(e)
+            continue
+        except json.JSONDecodeError as e:
+            yield row_number, f"Invalid JSON: {e.msg}"
+            continue
+        if not isinstance(record, dict):
+            yield row_number, "Each line must be a JSON object"
+            continue
+        yield row_number, record
+
+
+async def iter_csv_records(stream: AsyncIterator[bytes]) -> AsyncIterator[StreamRecord]:
+    """Yields (row_number, record) for every CSV record after the header.
+    A single csv.reader parses the whole stream, so quoted fields may span lines.
+    Empty cells are dropped so the DTO defaults apply."""
+    header: List[str] = []
+    row_number = 0
+    feeder = _LineFeeder()
+    reader = csv.reader(feeder)
+    # Con un número impar de comillas el registro sigue en la línea siguiente
+    open_quotes = False
+    async for raw_line in iter_lines(stream):
+        try:
+            line = raw_line.decode("utf-8")
+        except UnicodeDecodeError as e:
+            if not header:
+                yield 0, f"Header: {_decode_error(e)}"
+                return
+            row_number += 1
+            yield row_number, _decode_error(e)
+            feeder.lines.clear()
+            open_quotes = False
+            continue
+        if not open_quotes and not line.strip():
+            continue
+
+        feeder.lines.append(line + "\n")
+        open_quotes ^= line.count('"') % 2 == 1
+        if open_quotes:
+            continue
+
+        try:
+            values = next(reader)
+        except csv.Error as e:
+            feeder.lines.clear()
+            if not header:
+                yield 0, f"Header: {e}"
+                return
+            row_number += 1
+            yield row_number, f"Invalid CSV: {e}"
+            continue
+        if not header:
+            header = [name.strip() for name in values]
+            continue
+        row_number += 1
+        if len(values) != len(header):
+            yield row_number, f"Expected {len(header)} columns, found {len(values)}"
+            continue
+        yield row_number, {name: value for name, value in zip(header, values) if value != ""}
+
+    if open_quotes:
+        yield row_number + 1, "Unterminated quoted field"
+
+
+async def iter_chunks(records: AsyncIterator[StreamRecord], size: int) -> AsyncIterator[List[StreamRecord]]:
+    """Groups streamed records in lists of at most size elements"""
+    chunk: List[StreamRecord] = []
+    async for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def encode_ndjson_rows(rows: List[Dict[str, Any]]) -> bytes:
+    """One JSON object per line, encoded by pydantic-core"""
+    return b"".join(to_json(row) + b"\n" for row in rows)
+
+
+def encode_csv_rows(rows: List[Dict[str, Any]], fields: Sequence[str], include_header: bool = False) -> bytes:
+    """CSV lines for the given rows, with the header line when include_header is True"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if include_header:
+        writer.writerow(fields)
+    for row in rows:
+        writer.writerow(_csv_value(row[field]) for field in fields)
+    return buffer.getvalue().encode("utf-8")
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return "" if value is None else value
+
+
+async def gzip_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Compress a byte stream incrementally, keeping memory bounded"""
+    compressor = zlib.compressobj(wbits=31)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -1,5 +1,8 @@
-from typing import TypeVar, Generic, Optional
-from pydantic import BaseModel
+from functools import lru_cache
+from typing import TypeVar, Generic, Optional, Any, Type
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
 
 T = TypeVar('T')
 
@@ -7,3 +10,33 @@ class ApiResponse(BaseModel, Generic[T]):
     api_message: str
     api_data: Optional[T] = None
     errors: Optional[list[str]] = None
+
+
+class ApiJSONResponse(JSONResponse):
+    """JSONResponse rendered by pydantic-core instead of json.dumps.
+    Already encoded bytes are sent as they are."""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return to_json(content)
+
+
+@lru_cache(maxsize=None)
+def get_api_response_adapter(response_type: Type[ApiResponse]) -> TypeAdapter:
+    """One TypeAdapter per ApiResponse[T], built the first time it is needed"""
+    return TypeAdapter(response_type)
+
+
+def api_json_response(response: ApiResponse, status_code: int = 200) -> ApiJSONResponse:
+    """Encode an ApiResponse once with its cached adapter, skipping FastAPI's
+    response_model validation and jsonable_encoder pass"""
+    adapter = get_api_response_adapter(type(response))
+    return ApiJSONResponse(content=adapter.dump_json(response), status_code=status_code)
+
+
+def api_json_response_from_data(api_message: str, api_data: Any, status_code: int = 200) -> ApiJSONResponse:
+    """Encode plain rows (dicts of UUIDs, datetimes, str...) straight to JSON
+    without building a model per row"""
+    content = {"api_message": api_message, "api_data": api_data, "errors": None}
+    return ApiJSONResponse(content=to_json(content), status_code=status_code)
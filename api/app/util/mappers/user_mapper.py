@@ -0,0 +1,19 @@
+from app.util.dtos.user import UserResponseDTO
+
+# Columns exposed by UserResponseDTO, used to select response rows without loading ORM objects
+USER_RESPONSE_FIELDS = tuple(UserResponseDTO.model_fields)
+
+
+def to_user_response_dto(user) -> UserResponseDTO:
+    """Convert a UserSchema row to UserResponseDTO"""
+    return UserResponseDTO(
+        id=str(user.id),
+        first_name=user.first_name,
+        last_name=user.last_name,
+        username=user.username,
+        email=user.email,
+        is_active=user.is_active,
+        is_admin=user.is_admin,
+        created_at=user.created_at,
+        updated_at=user.updated_at
+    )
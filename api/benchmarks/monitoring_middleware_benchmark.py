@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Measures the per-request overhead of the monitoring middleware on a trivial route:
+  - none: the app without monitoring
+  - http: the previous APIMonitoring registered with app.middleware("http")
+    (BaseHTTPMiddleware, two prints, HttpProcessInformation + LoggerMapper per request)
+  - asgi: the current pure ASGI APIMonitoring
+
+Requests are driven straight through the ASGI interface on one event loop, with the
+logger disabled in every variant so only the middleware work is compared.
+
+Run from the api folder: python -m benchmarks.monitoring_middleware_benchmark
+"""
+import asyncio
+import contextlib
+import io
+import logging
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi import FastAPI, Request
+
+from app.handlers.monitoring.api_monitoring import APIMonitoring, REQUEST_COUNT, REQUEST_LATENCY
+from app.infrastructure.settings.logger import logger
+from app.util.dtos.extra_logger_information import HttpProcessInformation
+from app.util.mappers.logger_mapper import LoggerMapper
+
+REQUESTS = 5000
+
+
+async def previous_monitoring(request: Request, call_next):
+    """APIMonitoring.__call__ as it was before the ASGI rewrite"""
+    start_time = time.time()
+    print("Monitoring API request...")
+    response = await call_next(request)
+    print("API request processed.")
+    process_time = time.time() - start_time
+    REQUEST_LATENCY.labels(app_name="benchmark", endpoint=request.url.path).observe(process_time)
+    REQUEST_COUNT.labels(app_name="benchmark", method=request.method, endpoint=request.url.path, http_status=response.status_code).inc()
+    request_information = HttpProcessInformation(
+        method=request.method, url=str(request.url),
+        client_host=request.client.host if request.client else "unknown",
+        user_agent=request.headers.get("user-agent", ""),
+        status=response.status_code,
+        latency_ms=f"{process_time:.4f}s"
+    )
+    extra_data = LoggerMapper(extra_data=request_information).to_log_format()
+    logger.info("📊 Monitoring api request", extra=extra_data)
+    return response
+
+
+def build_app(variant: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"pong": True}
+
+    if variant == "http":
+        app.middleware("http")(previous_monitoring)
+    elif variant == "asgi":
+        app.add_middleware(APIMonitoring, app_name="benchmark")
+    return app
+
+
+async def run_requests(app: FastAPI, requests: int) -> float:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": "/ping", "raw_path": b"/ping",
+        "query_string": b"", "root_path": "", "server": ("testserver", 80),
+        "client": ("127.0.0.1", 5000), "headers": [(b"host", b"testserver"), (b"user-agent", b"benchmark")],
+    }
+
+    def connection():
+        """receive/send pair of one request; like a real server the client
+        only disconnects once the whole response has been sent"""
+        body_sent = False
+        response_complete = asyncio.Event()
+
+        async def receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await response_complete.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_complete.set()
+        return receive, send
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), *connection())
+    return time.perf_counter() - start
+
+
+async def main():
+    logging.getLogger("investment_api").disabled = True
+    results = {}
+    for variant in ("none", "http", "asgi"):
+        app = build_app(variant)
+        # Las prints del middleware anterior también cuentan, pero no se muestran
+        with contextlib.redirect_stdout(io.StringIO()):
+            await run_requests(app, 200)
+            results[variant] = await run_requests(app, REQUESTS)
+
+    print(f"{REQUESTS} GET /ping requests")
+    for variant, elapsed in results.items():
+        overhead = (elapsed - results["none"]) / REQUESTS * 1e6
+        print(f"  {variant:<5} {elapsed / REQUESTS * 1e6:8.1f} us/request   middleware overhead {overhead:8.1f} us")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Compares how a page of users is serialized:
+  - fastapi: one UserResponseDTO per row, FastAPI response_model validation,
+    jsonable_encoder and json.dumps (the previous path)
+  - adapter: one UserResponseDTO per row encoded by the cached ApiResponse[T] TypeAdapter
+  - rows: plain row dicts encoded straight to JSON by pydantic-core
+
+Run from the api folder: python -m benchmarks.serialization_benchmark
+"""
+import asyncio
+import json
+import os
+import sys
+import timeit
+import uuid
+from datetime import datetime
+from typing import List
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.util.dtos.user import UserResponseDTO
+from app.util.mappers.api_response import ApiResponse, api_json_response, api_json_response_from_data
+from app.util.mappers.user_mapper import to_user_response_dto, USER_RESPONSE_FIELDS
+
+PAGE_SIZE = 500
+ROUNDS = 200
+
+
+class UserRow:
+    def __init__(self, index: int):
+        self.id = uuid.uuid4()
+        self.first_name = f"First{index}"
+        self.last_name = f"Last{index}"
+        self.username = f"user{index}"
+        self.email = f"user{index}@example.com"
+        self.is_active = True
+        self.is_admin = False
+        self.created_at = datetime.now()
+        self.updated_at = datetime.now()
+
+
+def fastapi_path(users: List[UserRow], field, loop: asyncio.AbstractEventLoop) -> bytes:
+    dtos = [to_user_response_dto(user) for user in users]
+    content = ApiResponse[List[UserResponseDTO]](api_message="Users found", api_data=dtos)
+    serialized = loop.run_until_complete(serialize_response(field=field, response_content=content))
+    return json.dumps(jsonable_encoder(serialized)).encode("utf-8")
+
+
+def adapter_path(users: List[UserRow]) -> bytes:
+    dtos = [to_user_response_dto(user) for user in users]
+    return api_json_response(ApiResponse[List[UserResponseDTO]](api_message="Users found", api_data=dtos)).body
+
+
+def rows_path(rows: List[dict]) -> bytes:
+    return api_json_response_from_data("Users found", rows).body
+
+
+def main():
+    users = [UserRow(index) for index in range(PAGE_SIZE)]
+    rows = [{field: getattr(user, field) for field in USER_RESPONSE_FIELDS} for user in users]
+    field = create_response_field(name="response", type_=ApiResponse[List[UserResponseDTO]])
+    loop = asyncio.new_event_loop()
+
+    assert json.loads(fastapi_path(users, field, loop)) == json.loads(adapter_path(users)) == json.loads(rows_path(rows))
+
+    print(f"📊 Serializing {ROUNDS} pages of {PAGE_SIZE} users")
+    results = {
+        "fastapi": timeit.timeit(lambda: fastapi_path(users, field, loop), number=ROUNDS),
+        "adapter": timeit.timeit(lambda: adapter_path(users), number=ROUNDS),
+        "rows": timeit.timeit(lambda: rows_path(rows), number=ROUNDS),
+    }
+    baseline = results["fastapi"]
+    for name, total in results.items():
+        print(f"   {name:<8} {total / ROUNDS * 1000:8.3f} ms/page   x{baseline / total:5.1f}")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+AsyncRedisClient.get_or_compute against fakeredis (with Lua support).
+
+Run from the api folder: python -m unittest discover -s tests -t .
+"""
+import asyncio
+import os
+import time
+import unittest
+
+# Settings are required at import time; the values are never used to connect
+for name, value in {
+    "APP_NAME": "test", "APP_VERSION": "0", "ENVIRONMENT": "dev",
+    "POSTGRES_USER": "test", "POSTGRES_PASSWORD": "test", "POSTGRES_DB": "test",
+}.items():
+    os.environ.setdefault(name, value)
+
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeRedis
+
+from app.infrastructure.settings.redis_client import AsyncRedisClient, RELEASE_LOCK_SCRIPT
+
+
+def make_client(server: FakeServer) -> AsyncRedisClient:
+    """A client as one API worker would have it, all of them sharing `server`"""
+    client = AsyncRedisClient()
+    client.redis_client = FakeRedis(server=server)
+    client._release_lock = client.redis_client.register_script(RELEASE_LOCK_SCRIPT)
+    return client
+
+
+class GetOrComputeTest(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.server = FakeServer()
+        self.client = make_client(self.server)
+        self.calls = 0
+
+    async def slow_compute(self):
+        self.calls += 1
+        await asyncio.sleep(0.1)
+        return {"calls": self.calls}
+
+    async def test_miss_computes_and_caches(self):
+        self.assertEqual(await self.client.get_or_compute("key", self.slow_compute, ttl=60), {"calls": 1})
+        self.assertEqual(await self.client.get_or_compute("key", self.slow_compute, ttl=60), {"calls": 1})
+        self.assertEqual(self.calls, 1)
+
+    async def test_concurrent_callers_in_one_worker_compute_once(self):
+        values = await asyncio.gather(*(self.client.get_or_compute("key", self.slow_compute, ttl=60) for _ in range(20)))
+        self.assertEqual(self.calls, 1)
+        self.assertTrue(all(value == {"calls": 1} for value in values))
+
+    async def test_lock_contention_across_workers_computes_once(self):
+        workers = [self.client] + [make_client(self.server) for _ in range(3)]
+        values = await asyncio.gather(*(worker.get_or_compute("key", self.slow_compute, ttl=60) for worker in workers))
+        self.assertEqual(self.calls, 1)
+        self.assertTrue(all(value == {"calls": 1} for value in values))
+        self.assertFalse(await self.client.key_exists("key:lock"))
+
+    async def test_cancelled_caller_does_not_cancel_the_computation(self):
+        first = asyncio.create_task(self.client.get_or_compute("key", self.slow_compute, ttl=60))
+        second = asyncio.create_task(self.client.get_or_compute("key", self.slow_compute, ttl=60))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        self.assertEqual(await second, {"calls": 1})
+        self.assertEqual(self.calls, 1)
+
+    async def test_stale_value_is_served_while_refreshing(self):
+        entry = {"value": "old", "delta": 0.1, "expires_at": time.time() - 1}
+        await self.client.set_key("key", entry, expire=60)
+
+        self.assertEqual(await self.client.get_or_compute("key", self.slow_compute, ttl=60, stale_ttl=60), "old")
+        await asyncio.gather(*self.client._computations.values())
+        self.assertEqual(self.calls, 1)
+        self.assertEqual((await self.client.get_key("key"))["value"], {"calls": 1})
+
+    async def test_expired_value_without_stale_ttl_waits_for_the_new_one(self):
+        entry = {"value": "old", "delta": 0.1, "expires_at": time.time() - 1}
+        await self.client.set_key("key", entry, expire=60)
+
+        self.assertEqual(await self.client.get_or_compute("key", self.slow_compute, ttl=60), {"calls": 1})
+
+    async def test_waiter_gets_the_value_computed_by_the_lock_holder(self):
+        other_worker = make_client(self.server)
+        await other_worker.redis_client.set("key:lock", "other-token")
+        computing = asyncio.create_task(self.client.get_or_compute("key", self.slow_compute, ttl=60))
+        await asyncio.sleep(0.05)
+        await other_worker.set_key("key", {"value": "theirs", "delta": 0.1, "expires_at": time.time() + 60})
+        self.assertEqual(await computing, "theirs")
+        self.assertEqual(self.calls, 0)
+
+    async def test_release_only_deletes_our_own_lock(self):
+        await self.client.redis_client.set("key:lock", "other-token")
+        self.assertEqual(await self.client._release_lock(keys=["key:lock"], args=["our-token"]), 0)
+        self.assertEqual(await self.client.redis_client.get("key:lock"), b"other-token")
+        self.assertEqual(await self.client._release_lock(keys=["key:lock"], args=["other-token"]), 1)
+        self.assertIsNone(await self.client.redis_client.get("key:lock"))
+
+
+if __name__ == "__main__":
+    unittest.main()